@@ -5,7 +5,7 @@ C# Bindings Generator - Generate C# P/Invoke bindings from C header files
 from .code_generators import CodeGenerator, OutputBuilder
 from .constants import (CSHARP_TYPE_MAP, DEFAULT_NAMESPACE,
                         NATIVE_METHODS_CLASS, REQUIRED_USINGS)
-from .generator import CSharpBindingsGenerator
+from .generator import CSharpBindingsGenerator, GeneratorDiagnostic
 from .type_mapper import TypeMapper
 
 try:
@@ -15,6 +15,7 @@ except ImportError:
 
 __all__ = [
     "CSharpBindingsGenerator",
+    "GeneratorDiagnostic",
     "TypeMapper",
     "CodeGenerator",
     "OutputBuilder",
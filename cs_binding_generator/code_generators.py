@@ -2,10 +2,14 @@
 Code generation functions for C# bindings
 """
 
+import os
+import sys
+from datetime import datetime, timezone
 from typing import Optional
 
 from clang.cindex import CursorKind, Type, TypeKind
 
+from .constants import FIXED_BUFFER_ELEMENT_TYPES, REQUIRED_USINGS
 from .type_mapper import TypeMapper
 
 
@@ -93,14 +97,14 @@ class CodeGenerator:
         # Use LibraryImport for non-variadic functions. When skip_variadic is set,
         # is_variadic_for_generation will be False and we'll generate a normal LibraryImport.
         if is_variadic_for_generation:
-            code = f"""    [DllImport("{library_name}", EntryPoint = "{original_func_name}", CallingConvention = CallingConvention.Cdecl)]
+            parts = [f"""    [DllImport("{library_name}", EntryPoint = "{original_func_name}", CallingConvention = CallingConvention.Cdecl)]
 {return_marshal}    {self.visibility} static extern {result_type} {func_name}({params_str});
-"""
+"""]
         else:
-            code = f"""    [LibraryImport("{library_name}", EntryPoint = "{original_func_name}", StringMarshalling = StringMarshalling.Utf8)]
+            parts = [f"""    [LibraryImport("{library_name}", EntryPoint = "{original_func_name}", StringMarshalling = StringMarshalling.Utf8)]
     [UnmanagedCallConv(CallConvs = [typeof(CallConvCdecl)])]
 {return_marshal}    {self.visibility} static partial {result_type} {func_name}({params_str});
-"""
+"""]
 
         # Add helper function for char* return types (skip for variadic functions)
         if is_char_pointer_return and not is_variadic:
@@ -112,14 +116,14 @@ class CodeGenerator:
                 param_names.append(arg_name)
             param_names_str = ", ".join(param_names) if param_names else ""
 
-            code += f"""
+            parts.append(f"""
     [MethodImpl(MethodImplOptions.AggressiveInlining)]
     {self.visibility} static string? {func_name}String({params_str})
     {{
         var ptr = {func_name}({param_names_str});
         return ptr == 0 ? null : Marshal.PtrToStringUTF8((nint)ptr);
     }}
-"""
+""")
 
         # Add helper function for functions with char** parameters (output string pointers)
         # Skip for variadic functions
@@ -174,7 +178,7 @@ class CodeGenerator:
             return_statement = "return result;" if result_type != "void" else ""
             result_var = f"{result_type} result = " if result_type != "void" else ""
 
-            code += f"""
+            parts.append(f"""
     {self.visibility} static unsafe {result_type} {func_name}String({helper_params_str})
     {{
 {setup_str}
@@ -182,7 +186,7 @@ class CodeGenerator:
 {cleanup_str}
         {return_statement}
     }}
-"""
+""")
 
         # Add helper function for struct return types (skip for variadic functions)
         if is_struct_return and not is_variadic:
@@ -192,16 +196,17 @@ class CodeGenerator:
                           for i, arg in enumerate(cursor.get_arguments())]
             params_call_str = ", ".join(param_names) if param_names else ""
             
-            code += f"""
+            parts.append(f"""
     [MethodImpl(MethodImplOptions.AggressiveInlining)]
     {self.visibility} static unsafe {struct_return_type} {func_name}Struct({params_str})
     {{
         var ptr = {func_name}({params_call_str});
         return Marshal.PtrToStructure<{struct_return_type}>((nint)ptr);
     }}
-"""
+""")
 
-        return code
+        # Helpers are collected as parts and joined once
+        return "".join(parts)
 
     def _is_char_pointer(self, ctype) -> bool:
         """Check if a type is char* (pointer to char)"""
@@ -242,8 +247,9 @@ class CodeGenerator:
         # Collect fields with their offsets
         fields = []
         for field in cursor.get_children():
+            field_kind = field.kind
             # Handle anonymous unions/structs by flattening their members into the parent struct
-            if field.kind == CursorKind.UNION_DECL and field.spelling and "anonymous" in field.spelling.lower() and field.is_definition():
+            if field_kind == CursorKind.UNION_DECL and field.spelling and "anonymous" in field.spelling.lower() and field.is_definition():
                 # This is an anonymous union - flatten its members into the struct
                 for union_member in field.get_children():
                     if union_member.kind == CursorKind.FIELD_DECL:
@@ -273,7 +279,7 @@ class CodeGenerator:
                 continue
             
             # Handle anonymous structs by flattening their members
-            if field.kind == CursorKind.STRUCT_DECL and field.spelling and "anonymous" in field.spelling.lower() and field.is_definition():
+            if field_kind == CursorKind.STRUCT_DECL and field.spelling and "anonymous" in field.spelling.lower() and field.is_definition():
                 # This is an anonymous struct - flatten its members into the parent struct
                 for struct_member in field.get_children():
                     if struct_member.kind == CursorKind.FIELD_DECL:
@@ -301,7 +307,7 @@ class CodeGenerator:
                         fields.append(f"    [FieldOffset({offset_bytes})]\n    {self.visibility} {member_type} {member_name};")
                 continue
             
-            if field.kind == CursorKind.FIELD_DECL:
+            if field_kind == CursorKind.FIELD_DECL:
                 field_name = field.spelling
 
                 # Skip unnamed fields (anonymous unions/structs without definitions are already handled above)
@@ -325,32 +331,15 @@ class CodeGenerator:
                     if not element_csharp:
                         continue
 
-                    # Get element size
-                    element_size = element_type.get_size()  # size in bytes
-
                     # Check if element type is a primitive type (can use fixed keyword)
-                    # Note: bool is excluded because fixed bool arrays make structs managed
-                    primitive_types = {
-                        "byte",
-                        "sbyte",
-                        "short",
-                        "ushort",
-                        "int",
-                        "uint",
-                        "long",
-                        "ulong",
-                        "float",
-                        "double",
-                        "char",
-                    }
-
-                    if element_csharp in primitive_types:
+                    if element_csharp in FIXED_BUFFER_ELEMENT_TYPES:
                         # Use fixed array for primitive types
                         fields.append(
                             f"    [FieldOffset({offset_bytes})]\n    {self.visibility} fixed {element_csharp} {field_name}[{array_size}];"
                         )
                     else:
                         # Expand non-primitive arrays as individual fields with proper offsets
+                        element_size = element_type.get_size()  # size in bytes
                         for i in range(array_size):
                             field_offset = offset_bytes + (i * element_size)
                             fields.append(
@@ -425,32 +414,15 @@ class CodeGenerator:
                     if not element_csharp:
                         continue
 
-                    # Get element size
-                    element_size = element_type.get_size()
-
                     # Check if element type is a primitive type (can use fixed keyword)
-                    # Note: bool is excluded because fixed bool arrays make structs managed
-                    primitive_types = {
-                        "byte",
-                        "sbyte",
-                        "short",
-                        "ushort",
-                        "int",
-                        "uint",
-                        "long",
-                        "ulong",
-                        "float",
-                        "double",
-                        "char",
-                    }
-
-                    if element_csharp in primitive_types:
+                    if element_csharp in FIXED_BUFFER_ELEMENT_TYPES:
                         # Use fixed array for primitive types (starts at offset 0 for union)
                         fields.append(
                             f"    [FieldOffset(0)]\n    {self.visibility} fixed {element_csharp} {field_name}[{array_size}];"
                         )
                     else:
                         # Expand non-primitive arrays as individual fields, all starting at offset 0 (union behavior)
+                        element_size = element_type.get_size()  # size in bytes
                         for i in range(array_size):
                             field_offset = i * element_size
                             fields.append(
@@ -672,6 +644,20 @@ class CodeGenerator:
         return strings[0][:min_len]
 
 
+# Banner and nullable directive that open every generated file
+GENERATED_FILE_HEADER = """// <auto-generated />
+//
+// This file was automatically generated by cs-binding-generator
+// https://github.com/cs-binding-generator/cs-binding-generator
+// Generated on: {timestamp}
+// Command: {command_line}
+// Do not modify this file directly
+//
+
+#nullable enable
+"""
+
+
 class OutputBuilder:
     """Builds the final C# output file"""
 
@@ -692,10 +678,6 @@ class OutputBuilder:
         parts = []
 
         # Generated file header comment
-        import os
-        import sys
-        from datetime import datetime, timezone
-
         utc_now = datetime.now(timezone.utc)
         timestamp = utc_now.strftime("%Y-%m-%d %H:%M:%S UTC")
 
@@ -709,21 +691,9 @@ class OutputBuilder:
             argv_copy[0] = "cs_binding_generator"
         command_line = " ".join(argv_copy)
 
-        parts.append("// <auto-generated />")
-        parts.append("//")
-        parts.append("// This file was automatically generated by cs-binding-generator")
-        parts.append("// https://github.com/cs-binding-generator/cs-binding-generator")
-        parts.append(f"// Generated on: {timestamp}")
-        parts.append(f"// Command: {command_line}")
-        parts.append("// Do not modify this file directly")
-        parts.append("//")
-        parts.append("")
-        parts.append("#nullable enable")
-        parts.append("")
+        parts.append(GENERATED_FILE_HEADER.format(timestamp=timestamp, command_line=command_line))
 
         # Usings (non-global)
-        from .constants import REQUIRED_USINGS
-
         parts.extend(REQUIRED_USINGS)
 
         # Library-specific using statements
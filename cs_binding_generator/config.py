@@ -2,11 +2,11 @@
 XML configuration file parsing for C# bindings generator
 """
 
-import xml.etree.ElementTree as ET
+from xml.parsers import expat
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class BindingConfig:
     """Configuration for C# bindings generation"""
     header_library_pairs: list[tuple[str, str]] = field(default_factory=list)
@@ -23,121 +23,157 @@ class BindingConfig:
 
 
 def parse_config_file(config_path):
-    """Parse XML configuration file and return BindingConfig object"""
+    """Parse XML configuration file and return BindingConfig object
+
+    The file is read in one call and fed straight to an expat parser whose handlers fill in
+    the config as each element starts, so no element tree is ever built.
+    """
     try:
-        tree = ET.parse(config_path)
-        root = tree.getroot()
-
-        if root.tag != "bindings":
-            raise ValueError(f"Expected root element 'bindings', got '{root.tag}'")
-
-        config = BindingConfig()
-
-        # Get global visibility setting (default to "public")
-        config.visibility = root.get("visibility", "public").strip().lower()
-        if config.visibility not in ("public", "internal"):
-            import sys
-            print(f"Error: Invalid visibility value '{config.visibility}'. Must be 'public' or 'internal'.", file=sys.stderr)
-            sys.exit(1)
-
-        # Get global include directories
-        for include_dir in root.findall("include_directory"):
-            path = include_dir.get("path")
-            if not path:
-                raise ValueError("Include directory element missing 'path' attribute")
-            config.include_dirs.append(path.strip())
-
-        # Get global renames (support both simple and regex)
-        for rename in root.findall("rename"):
-            from_name = rename.get("from")
-            to_name = rename.get("to")
-            if not from_name or not to_name:
-                raise ValueError("Rename element missing 'from' or 'to' attribute")
-            is_regex = rename.get("regex", "false").lower() == "true"
-            config.renames.append((from_name.strip(), to_name.strip(), is_regex))
-
-        # Get global removals (support both simple and regex)
-        for remove in root.findall("remove"):
-            pattern = remove.get("pattern")
-            if not pattern:
-                raise ValueError("Remove element missing 'pattern' attribute")
-            is_regex = remove.get("regex", "false").lower() == "true"
-            config.removals.append((pattern.strip(), is_regex))
-
-        # Get global flag enums (enum patterns that should have [Flags] attribute)
-        for flag_enum in root.findall("flags"):
-            pattern = flag_enum.get("pattern")
-            if not pattern:
-                raise ValueError("Flags element missing 'pattern' attribute")
-            is_regex = flag_enum.get("regex", "false").lower() == "true"
-            config.flag_enums.append((pattern.strip(), is_regex))
-
-        # Get global compiler defines
-        for define in root.findall("define"):
-            name = define.get("name")
-            if not name:
-                raise ValueError("Define element missing 'name' attribute")
-            value = define.get("value")  # Optional, can be None
-            if value is not None:
-                value = value.strip()
-            config.global_defines.append((name.strip(), value))
-
-        # Get global constants (macros to extract)
-        # These are stored as a list of (name, pattern, type, is_flags) tuples
-        # They will be applied to all libraries during processing
-        for const in root.findall("constants"):
-            const_name = const.get("name")
-            const_pattern = const.get("pattern")
-            const_type = const.get("type", "uint")  # Default to uint
-            const_flags = const.get("flags", "false").lower() == "true"  # Default to false
-
-            if not const_name:
-                raise ValueError("Constants element missing 'name' attribute")
-            if not const_pattern:
-                raise ValueError("Constants element missing 'pattern' attribute")
-
-            config.global_constants.append((const_name.strip(), const_pattern.strip(), const_type.strip(), const_flags))
-
-        for library in root.findall("library"):
-            library_name = library.get("name")
-            if not library_name:
-                raise ValueError("Library element missing 'name' attribute")
-
-            # Get class name (default to NativeMethods if not specified)
-            class_name = library.get("class", "NativeMethods")
-            config.library_class_names[library_name.strip()] = class_name.strip()
-
-            # Get namespace from library attribute
-            library_namespace = library.get("namespace")
-            if library_namespace is not None:
-                config.library_namespaces[library_name.strip()] = library_namespace.strip()
-
-            # Get using statements
-            using_statements = []
-            for using in library.findall("using"):
-                using_namespace = using.get("namespace")
+        with open(config_path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    return _parse_config(lambda parser: parser.Parse(data, True))
+
+
+def parse_config_string(config_text):
+    """Parse XML configuration text and return BindingConfig object"""
+    return _parse_config(lambda parser: parser.Parse(config_text, True))
+
+
+def _parse_config(feed):
+    """Run an expat parser over the input supplied by feed(parser) and build the BindingConfig"""
+    config = BindingConfig()
+    library_include_dirs = []  # Appended after the global include directories
+    open_tags = []  # Tags of the elements enclosing the current element
+    library = {"name": None, "using": []}
+
+    def start_element(tag, attrs):
+        if not open_tags:
+            if tag != "bindings":
+                raise ValueError(f"Expected root element 'bindings', got '{tag}'")
+
+            # Get global visibility setting (default to "public")
+            config.visibility = attrs.get("visibility", "public").strip().lower()
+            if config.visibility not in ("public", "internal"):
+                import sys
+                print(f"Error: Invalid visibility value '{config.visibility}'. Must be 'public' or 'internal'.", file=sys.stderr)
+                sys.exit(1)
+
+        elif open_tags == ["bindings", "library"]:
+            library_name = library["name"]
+            if tag == "using":
+                # Get using statements
+                using_namespace = attrs.get("namespace")
                 if using_namespace:
-                    using_statements.append(using_namespace.strip())
-            if using_statements:
-                config.library_using_statements[library_name.strip()] = using_statements
+                    library["using"].append(using_namespace.strip())
 
-            # Get library-specific include directories
-            for include_dir in library.findall("include_directory"):
-                path = include_dir.get("path")
+            elif tag == "include_directory":
+                # Get library-specific include directories
+                path = attrs.get("path")
                 if not path:
                     raise ValueError(f"Include directory element in library '{library_name}' missing 'path' attribute")
-                config.include_dirs.append(path.strip())
+                library_include_dirs.append(path.strip())
 
-            # Get include files
-            for include in library.findall("include"):
-                header_path = include.get("file")
+            elif tag == "include":
+                # Get include files
+                header_path = attrs.get("file")
                 if not header_path:
                     raise ValueError(f"Include element in library '{library_name}' missing 'file' attribute")
-                config.header_library_pairs.append((header_path.strip(), library_name.strip()))
+                config.header_library_pairs.append((header_path.strip(), library_name))
+
+        elif open_tags == ["bindings"]:
+            if tag == "library":
+                library_name = attrs.get("name")
+                if not library_name:
+                    raise ValueError("Library element missing 'name' attribute")
+                library_name = library_name.strip()
+
+                # Get class name (default to NativeMethods if not specified)
+                class_name = attrs.get("class", "NativeMethods")
+                config.library_class_names[library_name] = class_name.strip()
+
+                # Get namespace from library attribute
+                library_namespace = attrs.get("namespace")
+                if library_namespace is not None:
+                    config.library_namespaces[library_name] = library_namespace.strip()
+
+                library["name"] = library_name
+                library["using"] = []
+
+            elif tag == "include_directory":
+                # Get global include directories
+                path = attrs.get("path")
+                if not path:
+                    raise ValueError("Include directory element missing 'path' attribute")
+                config.include_dirs.append(path.strip())
 
-        return config
+            elif tag == "rename":
+                # Get global renames (support both simple and regex)
+                from_name = attrs.get("from")
+                to_name = attrs.get("to")
+                if not from_name or not to_name:
+                    raise ValueError("Rename element missing 'from' or 'to' attribute")
+                is_regex = attrs.get("regex", "false").lower() == "true"
+                config.renames.append((from_name.strip(), to_name.strip(), is_regex))
+
+            elif tag == "remove":
+                # Get global removals (support both simple and regex)
+                pattern = attrs.get("pattern")
+                if not pattern:
+                    raise ValueError("Remove element missing 'pattern' attribute")
+                is_regex = attrs.get("regex", "false").lower() == "true"
+                config.removals.append((pattern.strip(), is_regex))
+
+            elif tag == "flags":
+                # Get global flag enums (enum patterns that should have [Flags] attribute)
+                pattern = attrs.get("pattern")
+                if not pattern:
+                    raise ValueError("Flags element missing 'pattern' attribute")
+                is_regex = attrs.get("regex", "false").lower() == "true"
+                config.flag_enums.append((pattern.strip(), is_regex))
+
+            elif tag == "define":
+                # Get global compiler defines
+                name = attrs.get("name")
+                if not name:
+                    raise ValueError("Define element missing 'name' attribute")
+                value = attrs.get("value")  # Optional, can be None
+                if value is not None:
+                    value = value.strip()
+                config.global_defines.append((name.strip(), value))
+
+            elif tag == "constants":
+                # Get global constants (macros to extract)
+                # These are stored as a list of (name, pattern, type, is_flags) tuples
+                # They will be applied to all libraries during processing
+                const_name = attrs.get("name")
+                const_pattern = attrs.get("pattern")
+                const_type = attrs.get("type", "uint")  # Default to uint
+                const_flags = attrs.get("flags", "false").lower() == "true"  # Default to false
+
+                if not const_name:
+                    raise ValueError("Constants element missing 'name' attribute")
+                if not const_pattern:
+                    raise ValueError("Constants element missing 'pattern' attribute")
+
+                config.global_constants.append((const_name.strip(), const_pattern.strip(), const_type.strip(), const_flags))
+
+        open_tags.append(tag)
+
+    def end_element(tag):
+        open_tags.pop()
+        if tag == "library" and open_tags == ["bindings"] and library["using"]:
+            config.library_using_statements[library["name"]] = library["using"]
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
 
-    except ET.ParseError as e:
+    try:
+        feed(parser)
+    except expat.ExpatError as e:
         raise ValueError(f"XML parsing error: {e}")
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+
+    config.include_dirs.extend(library_include_dirs)
+    return config
@@ -26,6 +26,23 @@ CSHARP_TYPE_MAP = {
     TypeKind.POINTER: "nint",  # Generic pointer, refined in type_mapper
 }
 
+# C# element types allowed in fixed-size buffers; array fields of any other type are
+# expanded into one field per element.
+# Note: bool is excluded because fixed bool arrays make structs managed
+FIXED_BUFFER_ELEMENT_TYPES = frozenset({
+    "byte",
+    "sbyte",
+    "short",
+    "ushort",
+    "int",
+    "uint",
+    "long",
+    "ulong",
+    "float",
+    "double",
+    "char",
+})
+
 # C# usings required for generated code
 REQUIRED_USINGS = [
     "using System.Runtime.InteropServices;",
@@ -2,9 +2,14 @@
 Main C# bindings generator orchestration
 """
 
+import functools
+import hashlib
 import os
 import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
@@ -15,12 +20,88 @@ from .code_generators import CodeGenerator, OutputBuilder
 from .constants import DEFAULT_NAMESPACE, NATIVE_METHODS_CLASS
 from .type_mapper import TypeMapper
 
+# Patterns used to pick numeric #define values out of header text
+_DEFINE_RE = re.compile(r"^\s*#\s*define\s+(\w+)\s+(.+?)(?://.*)?$")
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/")
+_CALL_RE = re.compile(r"^\w+\((.*)\)$")
+_MACRO_NAME_RE = re.compile(r"^[A-Z_][A-Z0-9_]+$")
+_DECIMAL_RE = re.compile(r"^-?\d+[uUlL]*$")
+_HEX_RE = re.compile(r"^0x[0-9A-Fa-f]+[uUlL]*$")
+_INTEGER_SUFFIX_RE = re.compile(r"([0-9A-Fa-f])([uUlL]+)\b")
+_NUMERIC_EXPRESSION_RE = re.compile(r"^[\s0-9A-Fa-fxX()<>|&\^~+\-*/%]+$")
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_index() -> clang.cindex.Index:
+    """Return the libclang index shared by all generators that were not given one"""
+    return clang.cindex.Index.create()
+
+
+# Per-thread state of the parse pool's worker threads
+_parse_worker = threading.local()
+
+
+def _create_worker_index():
+    """Give the current parse pool thread its own libclang index"""
+    _parse_worker.index = clang.cindex.Index.create()
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_pool() -> ThreadPoolExecutor:
+    """Return the thread pool used to parse several headers at once for generators without their own index
+
+    The pool lives for the rest of the process, so each worker thread creates its index only once
+    rather than on every generate() call. Generators given an index never submit work to it.
+    """
+    return ThreadPoolExecutor(max_workers=os.cpu_count() or 1, initializer=_create_worker_index)
+
+
+@functools.lru_cache(maxsize=None)
+def _system_include_args() -> tuple[str, ...]:
+    """Return -I arguments for the system include paths, queried from clang once per process"""
+    # These paths are typical locations for system headers
+    import subprocess
+
+    args = []
+    try:
+        # Try to get system include paths from clang itself
+        result = subprocess.run(["clang", "-E", "-v", "-"], input=b"", capture_output=True, text=False, timeout=2)
+        stderr = result.stderr.decode("utf-8", errors="ignore")
+        in_includes = False
+        for line in stderr.split("\n"):
+            if "#include <...> search starts here:" in line:
+                in_includes = True
+                continue
+            if in_includes:
+                if line.startswith("End of search list"):
+                    break
+                # Extract path from line like " /usr/include"
+                path = line.strip()
+                if path and path.startswith("/"):
+                    args.append(f"-I{path}")
+    except Exception:
+        # Fallback to common paths if clang query fails
+        # Don't print errors - this is a best-effort attempt
+        for path in ["/usr/lib/clang/21/include", "/usr/local/include", "/usr/include"]:
+            args.append(f"-I{path}")
+    return tuple(args)
+
+
+@dataclass
+class GeneratorDiagnostic:
+    """A problem reported while generating bindings, as also printed to stderr"""
+
+    level: str  # "warning", "error" or "fatal"
+    path: str
+    message: str
+
 
 class CSharpBindingsGenerator:
     """Main orchestrator for generating C# bindings from C headers"""
 
-    def __init__(self):
+    def __init__(self, index: Optional[clang.cindex.Index] = None, translation_units: Optional[dict] = None):
         self.type_mapper = TypeMapper()
+        self.index = index  # libclang index for every parse; if not provided, the process-wide shared index or the parse pool's per-thread indexes are used
         self.code_generator = None  # Will be initialized with visibility setting
         self.visibility = "public"  # Default visibility
 
@@ -40,12 +121,86 @@ class CSharpBindingsGenerator:
         # Store captured macros by library: library -> {macro_name: value}
         self.captured_macros = {}  # library -> {macro_name: value}
 
+        # Macros matched in each file during the current generate() call, so shared headers are scanned once
+        self._file_macros = {}  # file path -> {macro_name: value}
+
+        # Problems reported during the last generate() call
+        self.diagnostics = []  # [GeneratorDiagnostic]
+
+        # _is_system_header results by file path for the current generate() call
+        self._system_header_cache = {}
+
+        # In-memory header contents for the current generate() call: path -> source text
+        self.unsaved_files = {}
+
+        # Parsed translation units kept for reparsing on later generate() calls; may be shared between generators.
+        # Each entry carries the content hashes of its sources from the last clean parse (None otherwise), so any
+        # generator sharing the dict can skip reparsing unchanged headers without trusting a stale AST
+        self.translation_units = translation_units if translation_units is not None else {}  # (header_file, clang_args) -> (TranslationUnit, hashes)
+
     def _add_to_library_collection(self, collection: dict, library: str, item: str):
         """Add an item to a library-specific collection"""
         if library not in collection:
             collection[library] = []
         collection[library].append(item)
 
+    @staticmethod
+    def _source_paths(tu, header_file: str) -> set[str]:
+        """Return the paths of a translation unit's main file and everything it includes"""
+        paths = {str(header_file)}
+        paths.update(str(include.include) for include in tu.get_includes())
+        return paths
+
+    def _hash_sources(self, tu, header_file: str) -> tuple:
+        """Hash the contents of a translation unit's main file and everything it includes"""
+        hashes = []
+        for path in sorted(self._source_paths(tu, header_file)):
+            if path in self.unsaved_files:
+                data = self.unsaved_files[path].encode("utf-8")
+            else:
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                except OSError:
+                    data = None
+            hashes.append((path, hashlib.sha1(data).digest() if data is not None else None))
+        return tuple(hashes)
+
+    def _parse_header(self, index, header_file: str, clang_args: list[str], clang_unsaved_files: list, parse_options: int):
+        """Parse a header, reusing a cached translation unit when possible; safe to call from worker threads
+
+        Returns the translation unit and its error diagnostics as (severity, message) tuples.
+        """
+        # Reuse the translation unit from a previous run if the header was parsed with the same arguments,
+        # skipping the reparse entirely when no source changed since the last clean parse
+        tu_key = (str(header_file), tuple(clang_args))
+        tu, source_hashes = self.translation_units.get(tu_key, (None, None))
+        if tu is None:
+            tu = index.parse(header_file, args=clang_args, unsaved_files=clang_unsaved_files, options=parse_options)
+            source_hashes = None
+        elif source_hashes is None or self._hash_sources(tu, header_file) != source_hashes:
+            tu.reparse(unsaved_files=clang_unsaved_files, options=parse_options)
+            source_hashes = None
+
+        # One sweep over the diagnostics; the message is only read for errors
+        errors = [
+            (severity, diag.spelling)
+            for diag in tu.diagnostics
+            if (severity := diag.severity) >= clang.cindex.Diagnostic.Error
+        ]
+
+        # Only sources that parsed cleanly are memoized; a missing include may appear later
+        if errors:
+            source_hashes = None
+        elif source_hashes is None:
+            source_hashes = self._hash_sources(tu, header_file)
+        self.translation_units[tu_key] = (tu, source_hashes)
+        return tu, errors
+
+    def clear_cache(self):
+        """Drop the cached translation units so the next generate() parses every header from scratch"""
+        self.translation_units.clear()
+
     def _clear_state(self):
         """Clear all accumulated state for a new generation run"""
         self.generated_functions.clear()
@@ -57,6 +212,9 @@ class CSharpBindingsGenerator:
         self.seen_unions.clear()
         self.enum_members.clear()
         self.captured_macros.clear()
+        self._file_macros.clear()
+        self._system_header_cache.clear()
+        self.diagnostics.clear()
         self.source_file = None
 
     def _extract_macros_from_file(self, file_path: str, patterns: list[str]) -> dict[str, str]:
@@ -72,34 +230,39 @@ class CSharpBindingsGenerator:
         macros = {}
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    # Look for #define directives with simple numeric values
-                    # Pattern: #define NAME VALUE
-                    match = re.match(r'^\s*#\s*define\s+(\w+)\s+(.+?)(?://.*)?$', line)
-                    if match:
-                        macro_name = match.group(1)
-                        macro_value = match.group(2).strip()
-
-                        # Strip C-style comments (/**< ... */ or /* ... */)
-                        macro_value = re.sub(r'/\*.*?\*/', '', macro_value).strip()
-
-                        # Strip trailing commas
-                        macro_value = macro_value.rstrip(',')
-
-                        # Strip C cast macros like SDL_UINT64_C(0x...) and extract the value
-                        cast_match = re.match(r'^\w+\((.*)\)$', macro_value)
-                        if cast_match:
-                            macro_value = cast_match.group(1).strip()
-
-                        # Only capture macros with numeric-looking values or simple expressions
-                        # Skip macros that reference other identifiers (which would need evaluation)
-                        if self._is_numeric_macro_value(macro_value):
-                            # Check if this macro matches any of the patterns
-                            for pattern in patterns:
-                                if re.fullmatch(pattern, macro_name):
-                                    macros[macro_name] = macro_value
-                                    break
+            name_patterns = [re.compile(pattern) for pattern in patterns]
+            if file_path in self.unsaved_files:
+                lines = self.unsaved_files[file_path].splitlines()
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    lines = f.readlines()
+            for line in lines:
+                # Look for #define directives with simple numeric values
+                # Pattern: #define NAME VALUE
+                match = _DEFINE_RE.match(line)
+                if match:
+                    macro_name = match.group(1)
+                    macro_value = match.group(2).strip()
+
+                    # Strip C-style comments (/**< ... */ or /* ... */)
+                    macro_value = _BLOCK_COMMENT_RE.sub('', macro_value).strip()
+
+                    # Strip trailing commas
+                    macro_value = macro_value.rstrip(',')
+
+                    # Strip C cast macros like SDL_UINT64_C(0x...) and extract the value
+                    cast_match = _CALL_RE.match(macro_value)
+                    if cast_match:
+                        macro_value = cast_match.group(1).strip()
+
+                    # Only capture macros with numeric-looking values or simple expressions
+                    # Skip macros that reference other identifiers (which would need evaluation)
+                    if self._is_numeric_macro_value(macro_value):
+                        # Check if this macro matches any of the patterns
+                        for pattern in name_patterns:
+                            if pattern.fullmatch(macro_name):
+                                macros[macro_name] = macro_value
+                                break
         except Exception as e:
             # If we can't read the file, just skip it
             pass
@@ -120,15 +283,15 @@ class CSharpBindingsGenerator:
         # If it contains bare uppercase identifiers (not in function calls), skip it
         # This catches things like "SDL_WINDOW_HIGH_PIXEL_DENSITY" which reference other macros
         # Pattern: uppercase identifier that's not immediately followed by (
-        if re.match(r'^[A-Z_][A-Z0-9_]+$', value):
+        if _MACRO_NAME_RE.match(value):
             return False
 
         # Check if it's a plain number (hex, decimal, negative) with optional suffixes (u, l, ul, etc.)
-        if re.match(r'^-?\d+[uUlL]*$', value) or re.match(r'^0x[0-9A-Fa-f]+[uUlL]*$', value):
+        if _DECIMAL_RE.match(value) or _HEX_RE.match(value):
             return True
 
         # Check if it's a cast/macro call with numeric content: NAME(0x...)
-        if re.match(r'^\w+\(.*\)$', value):
+        if _CALL_RE.match(value):
             return True
 
         # Attempt to accept numeric expressions (including bitshifts) with suffixes such as 'u' or 'ul'.
@@ -136,11 +299,11 @@ class CSharpBindingsGenerator:
         # cleaned expression only contains numeric/hex tokens, operators and parentheses.
         try:
             # Remove suffix letters (u, U, l, L) that immediately follow a hex/decimal digit
-            cleaned = re.sub(r'([0-9A-Fa-f])([uUlL]+)\b', r'\1', value)
+            cleaned = _INTEGER_SUFFIX_RE.sub(r'\1', value)
 
             # Allowable characters after cleaning: digits, hex prefix x/X, whitespace, parentheses,
             # shift operators (<,>), bitwise operators (|,&,^,~), arithmetic (+-*/%), and hex digits.
-            if re.match(r'^[\s0-9A-Fa-fxX()<>|&\^~+\-*/%]+$', cleaned):
+            if _NUMERIC_EXPRESSION_RE.match(cleaned):
                 return True
         except re.error:
             # If regex operations fail for any reason, fall back to conservative False
@@ -150,7 +313,17 @@ class CSharpBindingsGenerator:
         return False
 
     def _is_system_header(self, file_path: str) -> bool:
-        """Check if a file path is a system header that should be excluded"""
+        """Check if a file path is a system header that should be excluded
+
+        Results are cached per path, so each file is resolved on disk only once.
+        """
+        cached = self._system_header_cache.get(file_path)
+        if cached is None:
+            cached = self._system_header_cache[file_path] = self._check_system_header(file_path)
+        return cached
+
+    def _check_system_header(self, file_path: str) -> bool:
+        """Uncached check behind _is_system_header"""
         path = Path(file_path).resolve()
         path_str = str(path)
 
@@ -234,26 +407,51 @@ class CSharpBindingsGenerator:
 
         return False
 
+    @staticmethod
+    def _cursor_file_name(cursor):
+        """Return the name of the file a cursor is declared in, or None
+
+        The location and file objects are cached by cindex, but File.name calls
+        clang_getFileName on every access, so callers read it once per cursor.
+        """
+        source_file = cursor.location.file
+        return source_file.name if source_file else None
+
     def process_cursor(self, cursor):
         """Recursively process AST nodes"""
         # Note: We don't filter files here anymore - we need to see all typedefs
         # to build a complete type resolution map. Filtering happens during code generation.
 
-        if cursor.kind == CursorKind.FUNCTION_DECL:
-            # Only generate code for non-system headers
-            if cursor.location.file:
-                file_path = str(cursor.location.file)
-                if self._is_system_header(file_path):
-                    # Don't generate code but still recurse
-                    for child in cursor.get_children():
-                        self.process_cursor(child)
-                    return
-            # Check if this function should be removed
+        # Read the kind once; each access is a property call plus an enumeration lookup
+        kind = cursor.kind
+
+        if kind == CursorKind.TRANSLATION_UNIT:
+            # Top-level declarations from system headers only contribute their typedefs to the
+            # resolution map, so skip the rest of them (and their subtrees) up front
+            for child in cursor.get_children():
+                if child.kind != CursorKind.TYPEDEF_DECL:
+                    file_name = self._cursor_file_name(child)
+                    if file_name and self._is_system_header(file_name):
+                        continue
+                self.process_cursor(child)
+            return
+
+        if kind == CursorKind.FUNCTION_DECL:
+            # Check if this function should be removed; this needs only the spelling, so it runs before
+            # the location lookup (both cases skip the function but still recurse)
             if self.type_mapper.should_remove(cursor.spelling):
                 # Skip this function entirely
                 for child in cursor.get_children():
                     self.process_cursor(child)
                 return
+            # Only generate code for non-system headers
+            file_name = self._cursor_file_name(cursor)
+            if file_name:
+                if self._is_system_header(file_name):
+                    # Don't generate code but still recurse
+                    for child in cursor.get_children():
+                        self.process_cursor(child)
+                    return
             # Check if we've already generated this function
             # Use global deduplication to avoid duplicate partial methods
             func_key = cursor.spelling  # Global deduplication by function name
@@ -263,27 +461,27 @@ class CSharpBindingsGenerator:
                     self._add_to_library_collection(self.generated_functions, self.current_library, code)
                     self.seen_functions.add(func_key)
 
-        elif cursor.kind == CursorKind.STRUCT_DECL:
+        elif kind == CursorKind.STRUCT_DECL:
             if cursor.is_definition():
                 # Skip anonymous structs - they are handled inline by their parent struct
                 if cursor.spelling and "anonymous" in cursor.spelling.lower():
                     return
-                # Only generate code for non-system headers
-                if cursor.location.file:
-                    file_path = str(Path(cursor.location.file.name).resolve())
-                    if self._is_system_header(file_path):
-                        # Don't generate code but still recurse
-                        for child in cursor.get_children():
-                            self.process_cursor(child)
-                        return
-                # Check if this struct should be removed
+                # Check if this struct should be removed, before the location lookup
                 if cursor.spelling and self.type_mapper.should_remove(cursor.spelling):
                     # Skip this struct entirely
                     for child in cursor.get_children():
                         self.process_cursor(child)
                     return
+                # Only generate code for non-system headers
+                file_name = self._cursor_file_name(cursor)
+                if file_name:
+                    if self._is_system_header(file_name):
+                        # Don't generate code but still recurse
+                        for child in cursor.get_children():
+                            self.process_cursor(child)
+                        return
                 # Use global deduplication to avoid duplicate struct definitions
-                struct_key = (cursor.spelling, str(cursor.location.file), cursor.location.line)
+                struct_key = (cursor.spelling, file_name, cursor.location.line)
                 if struct_key not in self.seen_structs:
                     code = self.code_generator.generate_struct(cursor)
                     if code:
@@ -293,53 +491,53 @@ class CSharpBindingsGenerator:
                         if cursor.spelling:
                             self.seen_structs.add((cursor.spelling, None, None))
 
-        elif cursor.kind == CursorKind.UNION_DECL:
+        elif kind == CursorKind.UNION_DECL:
             if cursor.is_definition():
                 # Skip anonymous unions - they are handled inline by their parent struct
                 if cursor.spelling and "anonymous" in cursor.spelling.lower():
                     return
-                # Only generate code for non-system headers
-                if cursor.location.file:
-                    file_path = str(Path(cursor.location.file.name).resolve())
-                    if self._is_system_header(file_path):
-                        # Don't generate code but still recurse
-                        for child in cursor.get_children():
-                            self.process_cursor(child)
-                        return
-                # Check if this union should be removed
+                # Check if this union should be removed, before the location lookup
                 if cursor.spelling and self.type_mapper.should_remove(cursor.spelling):
                     # Skip this union entirely
                     for child in cursor.get_children():
                         self.process_cursor(child)
                     return
+                # Only generate code for non-system headers
+                file_name = self._cursor_file_name(cursor)
+                if file_name:
+                    if self._is_system_header(file_name):
+                        # Don't generate code but still recurse
+                        for child in cursor.get_children():
+                            self.process_cursor(child)
+                        return
                 # Use global deduplication to avoid duplicate union definitions
-                union_key = (cursor.spelling, str(cursor.location.file), cursor.location.line)
+                union_key = (cursor.spelling, file_name, cursor.location.line)
                 if union_key not in self.seen_unions:
                     code = self.code_generator.generate_union(cursor)
                     if code:
                         self._add_to_library_collection(self.generated_unions, self.current_library, code)
                         self.seen_unions.add(union_key)
 
-        elif cursor.kind == CursorKind.ENUM_DECL:
+        elif kind == CursorKind.ENUM_DECL:
             if cursor.is_definition():
-                # Only generate code for non-system headers
-                if cursor.location.file:
-                    file_path = str(Path(cursor.location.file.name).resolve())
-                    if self._is_system_header(file_path):
-                        # Don't generate code but still recurse
-                        for child in cursor.get_children():
-                            self.process_cursor(child)
-                        return
-                # Check if this enum should be removed
+                # Check if this enum should be removed, before the location lookup
                 if cursor.spelling and self.type_mapper.should_remove(cursor.spelling):
                     # Skip this enum entirely
                     for child in cursor.get_children():
                         self.process_cursor(child)
                     return
+                # Only generate code for non-system headers
+                file_name = self._cursor_file_name(cursor)
+                if file_name:
+                    if self._is_system_header(file_name):
+                        # Don't generate code but still recurse
+                        for child in cursor.get_children():
+                            self.process_cursor(child)
+                        return
                 # Collect enum members for merging (handle duplicate enum names)
                 self._collect_enum_members(cursor)
 
-        elif cursor.kind == CursorKind.TYPEDEF_DECL:
+        elif kind == CursorKind.TYPEDEF_DECL:
             # Build typedef resolution map for ALL typedefs (including system headers)
             type_name = cursor.spelling
             underlying_type = cursor.underlying_typedef_type
@@ -348,9 +546,9 @@ class CSharpBindingsGenerator:
                 self.type_mapper.register_typedef(type_name, underlying_type)
 
             # Only generate code for non-system opaque struct typedefs
-            if cursor.location.file:
-                file_path = str(cursor.location.file)
-                if self._is_system_header(file_path):
+            file_name = self._cursor_file_name(cursor)
+            if file_name:
+                if self._is_system_header(file_name):
                     return
 
             # Handle opaque struct typedefs (e.g., typedef struct SDL_Window SDL_Window;)
@@ -377,7 +575,7 @@ class CSharpBindingsGenerator:
                         if self.type_mapper.should_remove(type_name):
                             return
 
-                        struct_key = (type_name, str(cursor.location.file), cursor.location.line)
+                        struct_key = (type_name, file_name, cursor.location.line)
                         # Use global deduplication
                         if struct_key not in self.seen_structs:
                             code = self.code_generator.generate_opaque_type(type_name)
@@ -403,7 +601,7 @@ class CSharpBindingsGenerator:
                                     if u_name and u_name != type_name:
                                         # Check if the underlying name should be removed
                                         if not self.type_mapper.should_remove(u_name):
-                                            u_struct_key = (u_name, str(cursor.location.file), cursor.location.line)
+                                            u_struct_key = (u_name, file_name, cursor.location.line)
                                             if u_struct_key not in self.seen_structs:
                                                 u_code = self.code_generator.generate_opaque_type(u_name)
                                                 if u_code:
@@ -417,7 +615,7 @@ class CSharpBindingsGenerator:
                         return
 
                     # Direct forward declaration
-                    struct_key = (child.spelling, str(cursor.location.file), cursor.location.line)
+                    struct_key = (child.spelling, file_name, cursor.location.line)
                     # Use global deduplication
                     if struct_key not in self.seen_structs:
                         code = self.code_generator.generate_opaque_type(child.spelling)
@@ -433,8 +631,16 @@ class CSharpBindingsGenerator:
             self.process_cursor(child)
 
     def prescan_opaque_types(self, cursor):
-        """Pre-scan AST to identify opaque types before processing functions"""
-        if cursor.kind == CursorKind.TYPEDEF_DECL:
+        """Pre-scan AST to identify opaque types before processing functions
+
+        Headers are parsed as C with function bodies skipped, so typedefs only occur at file scope;
+        only the translation unit's top-level declarations are visited, not the whole tree.
+        """
+        kind = cursor.kind
+        if kind == CursorKind.TRANSLATION_UNIT:
+            for child in cursor.get_children():
+                self.prescan_opaque_types(child)
+        elif kind == CursorKind.TYPEDEF_DECL:
             # Handle opaque struct typedefs (e.g., typedef struct SDL_Window SDL_Window;)
             children = list(cursor.get_children())
             if len(children) == 1:
@@ -460,10 +666,6 @@ class CSharpBindingsGenerator:
                     if not self.type_mapper.should_remove(child.spelling):
                         self.type_mapper.opaque_types.add(child.spelling)
 
-        # Recurse into children
-        for child in cursor.get_children():
-            self.prescan_opaque_types(child)
-
     def _collect_enum_members(self, cursor):
         """Collect enum members for merging duplicate enums"""
         from clang.cindex import CursorKind
@@ -527,7 +729,7 @@ class CSharpBindingsGenerator:
     def generate(
         self,
         header_library_pairs: list[tuple[str, str]],
-        output: str,
+        output: Optional[str],
         include_dirs: Optional[list[str]] = None,
         ignore_missing: bool = False,
         skip_variadic: bool = False,
@@ -537,12 +739,13 @@ class CSharpBindingsGenerator:
         visibility: str = "public",
         global_constants: Optional[list[tuple[str, str, str, bool]]] = None,
         global_defines: Optional[list[tuple[str, Optional[str]]]] = None,
+        unsaved_files: Optional[dict[str, str]] = None,
     ) -> dict[str, str]:
         """Generate C# bindings from C header file(s)
 
         Args:
             header_library_pairs: List of (header_file, library_name) tuples
-            output: Output directory for generated files (required)
+            output: Output directory for generated files, or None to return the contents without writing them
             include_dirs: List of directories to search for included headers
             ignore_missing: Continue processing even if some header files are not found
             skip_variadic: Skip generating bindings for variadic functions (default: True)
@@ -552,6 +755,7 @@ class CSharpBindingsGenerator:
             visibility: Visibility modifier for generated code ("public" or "internal")
             global_constants: List of (name, pattern, type) tuples for macro extraction, applied to all libraries
             global_defines: List of (name, value) tuples for compiler defines, applied to all headers
+            unsaved_files: Dict mapping file paths to header source; these are parsed from memory and need not exist on disk
         """
         # Store visibility setting
         self.visibility = visibility
@@ -574,6 +778,10 @@ class CSharpBindingsGenerator:
         # Store global defines
         self.global_defines = global_defines or []
 
+        # Store in-memory header contents
+        self.unsaved_files = unsaved_files or {}
+        clang_unsaved_files = list(self.unsaved_files.items())
+
         # Clear previous state
         self._clear_state()
 
@@ -593,46 +801,56 @@ class CSharpBindingsGenerator:
                 clang_args.append(f"-D{name}={value}")
 
         # Add system include paths so clang can find standard headers
-        # These paths are typical locations for system headers
-        import subprocess
-
-        try:
-            # Try to get system include paths from clang itself
-            result = subprocess.run(["clang", "-E", "-v", "-"], input=b"", capture_output=True, text=False, timeout=2)
-            stderr = result.stderr.decode("utf-8", errors="ignore")
-            in_includes = False
-            for line in stderr.split("\n"):
-                if "#include <...> search starts here:" in line:
-                    in_includes = True
-                    continue
-                if in_includes:
-                    if line.startswith("End of search list"):
-                        break
-                    # Extract path from line like " /usr/include"
-                    path = line.strip()
-                    if path and path.startswith("/"):
-                        clang_args.append(f"-I{path}")
-        except Exception:
-            # Fallback to common paths if clang query fails
-            # Don't print errors - this is a best-effort attempt
-            for path in ["/usr/lib/clang/21/include", "/usr/local/include", "/usr/include"]:
-                clang_args.append(f"-I{path}")
+        clang_args.extend(_system_include_args())
 
         # Parse each header file
-        index = clang.cindex.Index.create()
+        index = self.index if self.index is not None else _shared_index()
+
+        # The precompiled preamble makes reparsing the same header on later runs much cheaper
+        # Only declarations are bound, so function bodies are skipped and the header is parsed as an incomplete TU
+        # No detailed preprocessing record: includes come from get_includes() and macros are read from the
+        # header text, so macro and inclusion cursors would only lengthen the walk over the AST
+        parse_options = (
+            clang.cindex.TranslationUnit.PARSE_PRECOMPILED_PREAMBLE
+            | clang.cindex.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
+            | clang.cindex.TranslationUnit.PARSE_INCOMPLETE
+        )
 
-        # Parse options to get detailed preprocessing info (for include directives)
-        parse_options = clang.cindex.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
+        # With several headers, parse them concurrently (libclang releases the GIL while parsing);
+        # the results are still processed one at a time in the given order
+        # A generator given its own index parses every header serially with it, since an index is not shared between threads
+        # Each distinct header is checked for existence once, here
+        header_exists = {}
+        for header_file, _ in header_library_pairs:
+            header_path = str(header_file)
+            if header_path not in header_exists:
+                header_exists[header_path] = header_path in self.unsaved_files or os.path.exists(header_path)
+        headers_to_parse = [header_path for header_path, exists in header_exists.items() if exists]
+        parsed = {}
+        if len(headers_to_parse) > 1 and self.index is None:
+            # Each worker thread parses with its own index rather than sharing one between threads
+            executor = _parse_pool()
+            parsed = {
+                header_file: executor.submit(
+                    lambda header_file: self._parse_header(
+                        _parse_worker.index, header_file, clang_args, clang_unsaved_files, parse_options
+                    ),
+                    header_file,
+                )
+                for header_file in headers_to_parse
+            }
 
         successfully_processed = 0
 
         for header_file, library_name in header_library_pairs:
-            if not Path(header_file).exists():
+            if not header_exists[str(header_file)]:
                 if ignore_missing:
                     print(f"Warning: Header file not found: {header_file}", file=sys.stderr)
+                    self.diagnostics.append(GeneratorDiagnostic("warning", str(header_file), "Header file not found"))
                     continue
                 else:
                     print(f"Error: Header file not found: {header_file}", file=sys.stderr)
+                    self.diagnostics.append(GeneratorDiagnostic("error", str(header_file), "Header file not found"))
                     raise FileNotFoundError(f"Header file not found: {header_file}")
 
             self.source_file = header_file
@@ -641,17 +859,20 @@ class CSharpBindingsGenerator:
             if include_dirs:
                 print(f"Include directories: {', '.join(include_dirs)}")
 
-            tu = index.parse(header_file, args=clang_args, options=parse_options)
+            if str(header_file) in parsed:
+                tu, errors = parsed[str(header_file)].result()
+            else:
+                tu, errors = self._parse_header(index, header_file, clang_args, clang_unsaved_files, parse_options)
 
             # Check for parse errors (warnings don't stop processing)
             has_fatal_errors = False
             error_messages = []
-            for diag in tu.diagnostics:
-                if diag.severity >= clang.cindex.Diagnostic.Error:
-                    error_msg = f"Error in {header_file}: {diag.spelling}"
-                    print(error_msg, file=sys.stderr)
-                    error_messages.append(diag.spelling)
-                if diag.severity >= clang.cindex.Diagnostic.Fatal:
+            for severity, message in errors:
+                print(f"Error in {header_file}: {message}", file=sys.stderr)
+                error_messages.append(message)
+                is_fatal = severity >= clang.cindex.Diagnostic.Fatal
+                self.diagnostics.append(GeneratorDiagnostic("fatal" if is_fatal else "error", str(header_file), message))
+                if is_fatal:
                     has_fatal_errors = True
 
             if has_fatal_errors:
@@ -677,21 +898,17 @@ class CSharpBindingsGenerator:
 
                 # Extract macros from all files in the translation unit (not just the main header)
                 # This includes all #included files, which is where macros like SDL_WINDOW_* live
-                def collect_files(cursor, files_set):
-                    """Recursively collect all file paths from the AST"""
-                    if cursor.location.file:
-                        file_path = str(cursor.location.file)
-                        if not self._is_system_header(file_path):
-                            files_set.add(file_path)
-                    for child in cursor.get_children():
-                        collect_files(child, files_set)
-                
-                all_files = set()
-                collect_files(tu.cursor, all_files)
-                
+                # The include list comes from libclang directly, so no walk over the cursor tree is needed
+                all_files = {
+                    file_path for file_path in self._source_paths(tu, header_file) if not self._is_system_header(file_path)
+                }
+
                 # Extract macros from all non-system files
                 for file_path in all_files:
-                    file_macros = self._extract_macros_from_file(file_path, patterns)
+                    file_macros = self._file_macros.get(file_path)
+                    if file_macros is None:
+                        file_macros = self._extract_macros_from_file(file_path, patterns)
+                        self._file_macros[file_path] = file_macros
                     self.captured_macros[library_name].update(file_macros)
 
                 if self.captured_macros[library_name]:
@@ -770,13 +987,15 @@ class CSharpBindingsGenerator:
 
         return self._generate_multi_file_output(output)
 
-    def _generate_multi_file_output(self, output: str) -> dict[str, str]:
-        """Generate multiple files, one per library"""
-        if not output:
+    def _generate_multi_file_output(self, output: Optional[str]) -> dict[str, str]:
+        """Generate multiple files, one per library; nothing is written to disk when output is None"""
+        if output is None:
+            output_path = None
+        elif not output:
             raise ValueError("Output directory must be specified")
-
-        output_path = Path(output)
-        output_path.mkdir(parents=True, exist_ok=True)
+        else:
+            output_path = Path(output)
+            output_path.mkdir(parents=True, exist_ok=True)
 
         # Get all libraries
         all_libraries = set()
@@ -800,10 +1019,11 @@ class CSharpBindingsGenerator:
             visibility=self.visibility,
             has_variadic_functions=self.code_generator.has_variadic_functions,
         )
-        bindings_file = output_path / "bindings.cs"
-        bindings_file.write_text(bindings_content)
         file_contents["bindings.cs"] = bindings_content
-        print(f"Generated assembly bindings: {bindings_file}")
+        if output_path is not None:
+            bindings_file = output_path / "bindings.cs"
+            bindings_file.write_text(bindings_content)
+            print(f"Generated assembly bindings: {bindings_file}")
 
         for library in sorted(all_libraries):
             # Get items for this library
@@ -832,11 +1052,12 @@ class CSharpBindingsGenerator:
                 visibility=self.visibility,
             )
 
-            # Write to library-specific file
-            library_file = output_path / f"{library}.cs"
-            library_file.write_text(output)
             file_contents[f"{library}.cs"] = output
 
-            print(f"Generated bindings for {library}: {library_file}")
+            # Write to library-specific file
+            if output_path is not None:
+                library_file = output_path / f"{library}.cs"
+                library_file.write_text(output)
+                print(f"Generated bindings for {library}: {library_file}")
 
         return file_contents
@@ -19,7 +19,8 @@ from cs_binding_generator.generator import CSharpBindingsGenerator
 from cs_binding_generator import __version__
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser"""
     parser = argparse.ArgumentParser(
         description=f"C# Bindings Generator v{__version__}\nGenerate C# bindings from C header files using LibraryImport",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -63,8 +64,11 @@ Examples:
         help="Generate variadic functions with __arglist parameter using DllImport (non-AOT compatible). By default, variadic functions are generated with the variadic parameter omitted, which typically works due to calling conventions but may cause stack cleanup issues.",
     )
 
-    args = parser.parse_args()
+    return parser
 
+
+def validate_args(args: argparse.Namespace) -> None:
+    """Fill in default config and output locations, exiting if no config file is available"""
     # Default config file to cs-bindings.xml in current directory if not specified
     if not args.config:
         default_config = "cs-bindings.xml"
@@ -80,6 +84,11 @@ Examples:
     if not args.output:
         args.output = "."
 
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    validate_args(args)
+
     # Handle configuration file
     try:
         config = parse_config_file(args.config)
@@ -134,6 +143,8 @@ Examples:
         traceback.print_exc(file=sys.stderr)
         sys.exit(1)
 
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
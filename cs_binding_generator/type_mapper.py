@@ -2,10 +2,23 @@
 Type mapping logic for converting C types to C# types
 """
 
+import re
+import sys
+
 from clang.cindex import TypeKind
 
 from .constants import CSHARP_TYPE_MAP
 
+# Leading qualifiers and tag keywords stripped (repeatedly) when normalizing a type spelling
+_TYPE_PREFIX_RE = re.compile(r"^(?:(?:const|volatile|restrict|struct|union|enum|class) )+")
+
+# Prefixes stripped from record spellings, which keep an 'enum ' tag (and, for pointees, 'restrict ')
+_RECORD_PREFIX_RE = re.compile(r"^(?:(?:const|volatile|restrict|struct|union|class) )+")
+_RECORD_POINTEE_PREFIX_RE = re.compile(r"^(?:(?:const|volatile|struct|union|class) )+")
+
+# Typedef lookups strip each prefix in turn, in this order
+_TYPEDEF_PREFIX_RE = re.compile(r"^(?:const )*(?:volatile )*(?:restrict )*(?:struct )*(?:union )*(?:enum )*(?:class )*")
+
 
 class TypeMapper:
     """Maps C/libclang types to C# types"""
@@ -27,10 +40,42 @@ class TypeMapper:
         self.opaque_types = set()
         # Global renames that apply to all types/functions - list of (pattern, replacement, is_regex) tuples
         self.renames = []
+        # Rename rules prepared for matching, each tagged with its position in self.renames:
+        # exact names map to the first rule for that name, regex rules are kept in order
+        self._exact_renames = {}  # name -> (position, replacement)
+        self._regex_renames = []  # [(position, compiled regex, replacement)]
         # Global removals that filter out types/functions - list of (pattern, is_regex) tuples
         self.removals = []
+        # Removal patterns prepared for matching: exact names and compiled regexes
+        self._removal_names = set()
+        self._removal_regexes = []
+        # All regex removals as one alternation, or None when they cannot be combined safely
+        self._removal_regex = None
         # Global flag enums that should have [Flags] attribute - list of (pattern, is_regex) tuples
         self.flag_enums = []
+        # Flag enum patterns prepared for matching: exact names and compiled regexes
+        self._flag_enum_names = set()
+        self._flag_enum_regexes = []
+        # Results of apply_rename / should_remove by name; cleared whenever a pattern is added
+        self._rename_cache = {}
+        self._removal_cache = {}
+
+    def reset(self) -> None:
+        """Drop registered renames, removals and flag enum patterns, and types learned from parsed headers"""
+        self.typedef_chain.clear()
+        self.opaque_types.clear()
+        self.renames.clear()
+        self._exact_renames.clear()
+        self._regex_renames.clear()
+        self.removals.clear()
+        self._removal_names.clear()
+        self._removal_regexes.clear()
+        self._removal_regex = None
+        self.flag_enums.clear()
+        self._flag_enum_names.clear()
+        self._flag_enum_regexes.clear()
+        self._rename_cache.clear()
+        self._removal_cache.clear()
 
     def register_typedef(self, name: str, underlying_type) -> None:
         """Register a typedef for later resolution"""
@@ -145,27 +190,26 @@ class TypeMapper:
         # Handle pointers
         if ctype.kind == TypeKind.POINTER:
             pointee = ctype.get_pointee()
+            # Read libclang properties once; each access calls into the C library
+            pointee_kind = pointee.kind
+            pointee_name = pointee.spelling if hasattr(pointee, "spelling") else None
 
             # char* handling depends on context:
             # - Return type: nuint (caller shouldn't free the pointer)
             # - Struct field: nuint (must be unmanaged)
             # - Parameter: string (for passing C strings as input)
-            if pointee.kind in (TypeKind.CHAR_S, TypeKind.CHAR_U):
+            if pointee_kind in (TypeKind.CHAR_S, TypeKind.CHAR_U):
                 # Return types and struct fields should remain unmanaged (`nuint`),
                 # but parameters that accept strings should be nullable (`string?`) to
                 # reflect that C APIs often accept NULL for optional strings.
                 return "nuint" if (is_return_type or is_struct_field) else "string?"
 
             # void* -> nint
-            if pointee.kind == TypeKind.VOID:
+            if pointee_kind == TypeKind.VOID:
                 return "nint"
 
-            # Handle pointer to typedef (e.g., Uint8*, Sint16*)
-            # ELABORATED types can also be typedefs - check typedef chain first
-            pointee_name = pointee.spelling if hasattr(pointee, "spelling") else None
-
             # Handle double pointers (e.g., Uint8** -> byte**, char** -> nuint)
-            if pointee.kind == TypeKind.POINTER:
+            if pointee_kind == TypeKind.POINTER:
                 inner_pointee = pointee.get_pointee()
                 # char** should be nuint (not string*) to keep it unmanaged
                 if inner_pointee.kind in (TypeKind.CHAR_S, TypeKind.CHAR_U):
@@ -174,6 +218,8 @@ class TypeMapper:
                 if inner_mapped and inner_mapped != "nint":
                     return f"{inner_mapped}*"
 
+            # Handle pointer to typedef (e.g., Uint8*, Sint16*)
+            # ELABORATED types can also be typedefs - check typedef chain first
             # Strip qualifiers from pointee name before checking typedefs
             if pointee_name:
                 clean_name = pointee_name
@@ -192,27 +238,18 @@ class TypeMapper:
                     return f"{self.apply_rename(mapped_type)}*"
 
             # Also try mapping if it's explicitly a TYPEDEF kind
-            if pointee.kind == TypeKind.TYPEDEF:
+            if pointee_kind == TypeKind.TYPEDEF:
                 mapped_type = self.map_type(pointee, is_return_type=False)
                 if mapped_type and mapped_type != "nint":
                     return f"{mapped_type}*"
 
             # Get struct name for pointer to struct (handles RECORD and ELABORATED types)
             struct_name = None
-            if pointee.kind == TypeKind.ELABORATED:
+            if pointee_kind == TypeKind.ELABORATED:
                 # For elaborated types, use the spelling directly
-                if hasattr(pointee, "spelling"):
-                    struct_name = pointee.spelling
-                    # Strip const and other qualifiers - may need multiple passes
-                    while True:
-                        stripped = False
-                        for prefix in ["const ", "volatile ", "restrict ", "struct ", "union ", "enum ", "class "]:
-                            if struct_name.startswith(prefix):
-                                struct_name = struct_name[len(prefix) :]
-                                stripped = True
-                                break
-                        if not stripped:
-                            break
+                if pointee_name is not None:
+                    # Strip const and other qualifiers (any number of them)
+                    struct_name = _TYPE_PREFIX_RE.sub("", pointee_name)
 
                     # Try to resolve through typedef chain for ELABORATED types that are typedefs
                     # Example: SDL_TLSID is ELABORATED but is actually a typedef to SDL_AtomicInt
@@ -220,33 +257,24 @@ class TypeMapper:
                     resolved = self.resolve_typedef_chain(struct_name)
                     if resolved and resolved != struct_name:
                         struct_name = resolved
-            elif pointee.kind == TypeKind.RECORD:
+            elif pointee_kind == TypeKind.RECORD:
                 # For record types, strip 'struct ', 'const ' prefixes - may need multiple passes
-                if hasattr(pointee, "spelling"):
-                    struct_name = pointee.spelling
-                    while True:
-                        stripped = False
-                        for prefix in ["const ", "volatile ", "struct ", "union ", "class "]:
-                            if struct_name.startswith(prefix):
-                                struct_name = struct_name[len(prefix) :]
-                                stripped = True
-                                break
-                        if not stripped:
-                            break
+                if pointee_name is not None:
+                    struct_name = _RECORD_POINTEE_PREFIX_RE.sub("", pointee_name)
 
             # All struct/union pointers use typed pointers (Type*)
             if struct_name:
                 return f"{self.apply_rename(struct_name)}*"
 
             # Pointer to struct/union with ELABORATED type but no name
-            if pointee.kind in (TypeKind.RECORD, TypeKind.ELABORATED):
+            if pointee_kind in (TypeKind.RECORD, TypeKind.ELABORATED):
                 return "nint"
  
             # Function pointer (pointer to function prototype) -> when used as a struct field
             # libclang represents function pointers as POINTER whose pointee is FUNCTIONPROTO/FUNCTIONNOPROTO
             # Emit a raw C# function pointer type for struct fields so it can be cast/invoked by consumers.
             # Use unmanaged Cdecl calling convention as a sensible default for C libraries.
-            if pointee.kind in (TypeKind.FUNCTIONPROTO, TypeKind.FUNCTIONNOPROTO):
+            if pointee_kind in (TypeKind.FUNCTIONPROTO, TypeKind.FUNCTIONNOPROTO):
                 # Try to build an accurate C# function-pointer signature.
                 # Default to using nint for unknown return/parameter types.
                 try:
@@ -306,8 +334,8 @@ class TypeMapper:
                     return "delegate* unmanaged[Cdecl]<nint>"
             
             # Handle pointers to enums (e.g., MyEnum* -> MyEnum*, not "enum MyEnum*")
-            if pointee.kind == TypeKind.ENUM:
-                enum_name = pointee.spelling if hasattr(pointee, "spelling") else None
+            if pointee_kind == TypeKind.ENUM:
+                enum_name = pointee_name
                 if enum_name:
                     # Strip "enum " prefix if present
                     if enum_name.startswith("enum "):
@@ -319,8 +347,8 @@ class TypeMapper:
             
             # Handle pointers to primitive types (e.g., int*, uint*, float*)
             # This must come before the nint fallback
-            if pointee.kind in self.type_map:
-                primitive_type = self._map_primitive_kind(pointee.kind, pointee, is_struct_field=False)
+            if pointee_kind in self.type_map:
+                primitive_type = self._map_primitive_kind(pointee_kind, pointee, is_struct_field=False)
                 return f"{primitive_type}*"
             
             # Other pointers -> nint for safety
@@ -358,10 +386,7 @@ class TypeMapper:
             if hasattr(ctype, "spelling"):
                 spelling = ctype.spelling
                 # Strip qualifiers before checking typedef_map
-                clean_spelling = spelling
-                for prefix in ["const ", "volatile ", "restrict ", "struct ", "union ", "enum ", "class "]:
-                    while clean_spelling.startswith(prefix):
-                        clean_spelling = clean_spelling[len(prefix) :]
+                clean_spelling = _TYPEDEF_PREFIX_RE.sub("", spelling)
 
                 # Try typedef chain first (runtime-discovered types)
                 if clean_spelling:
@@ -421,14 +446,7 @@ class TypeMapper:
                 spelling = ctype.spelling
                 if spelling:
                     # Strip all qualifiers and keywords
-                    changed = True
-                    while changed:
-                        changed = False
-                        for prefix in ["const ", "volatile ", "restrict ", "struct ", "union ", "class "]:
-                            if spelling.startswith(prefix):
-                                spelling = spelling[len(prefix) :]
-                                changed = True
-                                break
+                    spelling = _RECORD_PREFIX_RE.sub("", spelling)
                     return self.apply_rename(spelling) if spelling else "nint"
             return "nint"
 
@@ -436,39 +454,41 @@ class TypeMapper:
         spelling = ctype.spelling if hasattr(ctype, "spelling") and ctype.spelling else None
         if spelling:
             # Strip ALL qualifiers and keywords repeatedly
-            changed = True
-            while changed:
-                changed = False
-                for prefix in ["const ", "volatile ", "restrict ", "struct ", "union ", "enum ", "class "]:
-                    if spelling.startswith(prefix):
-                        spelling = spelling[len(prefix) :]
-                        changed = True
-                        break
+            spelling = _TYPE_PREFIX_RE.sub("", spelling)
             return self.apply_rename(spelling) if spelling else "nint"
         return "nint"
 
     def add_rename(self, from_name: str, to_name: str, is_regex: bool = False):
         """Add a global rename mapping"""
+        position = len(self.renames)
         self.renames.append((from_name, to_name, is_regex))
+        if is_regex:
+            # Convert $1, $2 to \1, \2 for Python re.sub
+            self._regex_renames.append((position, re.compile(from_name), to_name.replace("$", "\\")))
+        else:
+            # Interned keys let lookups with identical identifier strings hit the identity fast path
+            self._exact_renames.setdefault(sys.intern(from_name), (position, sys.intern(to_name)))
+        self._rename_cache.clear()
 
     def apply_rename(self, name: str) -> str:
         """Apply rename rules in order (first match wins)"""
-        import re
-
-        result = name
-        for pattern, replacement, is_regex in self.renames:
-            if is_regex:
-                # Use fullmatch for precise identifier matching
-                if re.fullmatch(pattern, result):
-                    # Convert $1, $2 to \1, \2 for Python re.sub
-                    replacement_py = replacement.replace("$", "\\")
-                    result = re.sub(pattern, replacement_py, result)
-                    break  # First match wins
-            else:
-                # Simple exact match
-                if result == pattern:
-                    result = replacement
-                    break  # First match wins
+        if not self.renames:
+            return name
+        cached = self._rename_cache.get(name)
+        if cached is not None:
+            return cached
+        # An exact rule for the name is found with one lookup; only regex rules ahead of it can take precedence
+        exact = self._exact_renames.get(name)
+        last_position = exact[0] if exact else len(self.renames)
+        result = exact[1] if exact else name
+        for position, regex, replacement in self._regex_renames:
+            if position > last_position:
+                break
+            # Use fullmatch for precise identifier matching
+            if regex.fullmatch(name):
+                result = regex.sub(replacement, name)
+                break  # First match wins
+        self._rename_cache[name] = result
         return result
 
     def get_all_renames(self) -> list[tuple[str, str, bool]]:
@@ -478,21 +498,42 @@ class TypeMapper:
     def add_removal(self, pattern: str, is_regex: bool = False):
         """Add a removal pattern to filter out types/functions"""
         self.removals.append((pattern, is_regex))
+        if is_regex:
+            self._removal_regexes.append(re.compile(pattern))
+            self._removal_regex = self._combine_regexes(self._removal_regexes)
+        else:
+            self._removal_names.add(sys.intern(pattern))
+        self._removal_cache.clear()
+
+    @staticmethod
+    def _combine_regexes(regexes: list[re.Pattern]) -> re.Pattern | None:
+        """Join compiled regexes into one alternation so a name is matched against all of them in one call
+
+        Returns None if any pattern has groups, since combining would renumber its backreferences,
+        or if the patterns cannot be joined (e.g. inline global flags).
+        """
+        if any(regex.groups for regex in regexes):
+            return None
+        try:
+            return re.compile("|".join(f"(?:{regex.pattern})" for regex in regexes))
+        except re.error:
+            return None
 
     def should_remove(self, name: str) -> bool:
-        """Check if a name should be removed (first match wins)"""
-        import re
-
-        for pattern, is_regex in self.removals:
-            if is_regex:
-                # Use fullmatch for precise identifier matching
-                if re.fullmatch(pattern, name):
-                    return True  # First match wins
-            else:
-                # Simple exact match
-                if name == pattern:
-                    return True  # First match wins
-        return False
+        """Check if a name should be removed (any pattern matches)"""
+        cached = self._removal_cache.get(name)
+        if cached is not None:
+            return cached
+        # All exact names are checked with one set lookup before any regex runs
+        # Use fullmatch for precise identifier matching
+        if name in self._removal_names:
+            result = True
+        elif self._removal_regex is not None:
+            result = self._removal_regex.fullmatch(name) is not None
+        else:
+            result = any(regex.fullmatch(name) for regex in self._removal_regexes)
+        self._removal_cache[name] = result
+        return result
 
     def get_all_removals(self) -> list[tuple[str, bool]]:
         """Get all removal patterns as list of tuples"""
@@ -501,21 +542,17 @@ class TypeMapper:
     def add_flag_enum(self, pattern: str, is_regex: bool = False):
         """Add a flag enum pattern to mark enums with [Flags] attribute"""
         self.flag_enums.append((pattern, is_regex))
+        if is_regex:
+            self._flag_enum_regexes.append(re.compile(pattern))
+        else:
+            self._flag_enum_names.add(sys.intern(pattern))
 
     def is_flag_enum(self, name: str) -> bool:
-        """Check if an enum should have [Flags] attribute (first match wins)"""
-        import re
-
-        for pattern, is_regex in self.flag_enums:
-            if is_regex:
-                # Use fullmatch for precise identifier matching
-                if re.fullmatch(pattern, name):
-                    return True  # First match wins
-            else:
-                # Simple exact match
-                if name == pattern:
-                    return True  # First match wins
-        return False
+        """Check if an enum should have [Flags] attribute (any pattern matches)"""
+        if name in self._flag_enum_names:
+            return True
+        # Use fullmatch for precise identifier matching
+        return any(regex.fullmatch(name) for regex in self._flag_enum_regexes)
 
     def _map_primitive_kind(self, kind, ctype, is_struct_field: bool = False) -> str:
         """Map primitive TypeKind to C# type, considering platform-sized types like long/unsigned long
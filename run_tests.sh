@@ -1,3 +1,9 @@
 #!/bin/bash
 
-python -m pytest
+# Keep pytest's temp root on tmpfs when available; pytest still manages its own pytest-of-<user>/pytest-N dirs there
+if [ -z "$PYTEST_DEBUG_TEMPROOT" ] && [ -d /dev/shm ] && [ -w /dev/shm ]; then
+    export PYTEST_DEBUG_TEMPROOT=/dev/shm
+fi
+
+# Tests are independent, so spread them across all cores (pytest-xdist is in the dev extras)
+python -m pytest -n auto "$@"
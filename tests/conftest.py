@@ -3,15 +3,82 @@ Pytest configuration and fixtures
 """
 
 import pytest
-from pathlib import Path
-import tempfile
+import os
+import shutil
+import subprocess
+import sys
+
+from cs_binding_generator.generator import CSharpBindingsGenerator
+
+
+@pytest.fixture(scope="session")
+def cli_command():
+    """Command prefix for running the CLI in a subprocess
+
+    Prefers the installed console script, which avoids the module lookup done by ``python -m``,
+    and falls back to ``python -m`` when the package is not installed.
+    """
+    script = shutil.which("cs_binding_generator")
+    if script:
+        return [script]
+    return [sys.executable, "-B", "-m", "cs_binding_generator.main"]
+
+
+@pytest.fixture(scope="session")
+def cli_env():
+    """Environment for CLI subprocesses: UTF-8 I/O, no .pyc writes and no user site-packages"""
+    return os.environ | {"PYTHONUTF8": "1", "PYTHONDONTWRITEBYTECODE": "1", "PYTHONNOUSERSITE": "1"}
+
+
+CLI_TIMEOUT = 120  # seconds; generous enough for large system headers
+
+
+@pytest.fixture(scope="session")
+def run_cli(cli_command, cli_env):
+    """Run the CLI in a subprocess with the given arguments, capturing output as bytes
+
+    Output is collected with a single communicate() call; a hung CLI is killed after CLI_TIMEOUT.
+    """
+    def run(*args, cwd=None):
+        argv = [*cli_command, *args]
+        with subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd, env=cli_env) as proc:
+            try:
+                stdout, stderr = proc.communicate(timeout=CLI_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                raise
+        return subprocess.CompletedProcess(argv, proc.returncode, stdout, stderr)
+    return run
+
+
+@pytest.fixture(scope="session")
+def translation_unit_cache():
+    """Translation units shared by generators in the session, keyed by (header path, clang args)
+
+    Only headers that no test modifies should be parsed through this cache.
+    """
+    return {}
+
+
+@pytest.fixture(scope="class")
+def shared_generator(translation_unit_cache):
+    """Generator reused by a test class; generate() clears its per-run state on every call"""
+    return CSharpBindingsGenerator(translation_units=translation_unit_cache)
 
 
 @pytest.fixture
-def temp_header_file():
-    """Create a temporary C header file for testing"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.h', delete=False) as f:
-        f.write("""
+def generator(shared_generator):
+    """The shared generator with renames, removals and learned types from earlier tests cleared"""
+    shared_generator.type_mapper.reset()
+    return shared_generator
+
+
+@pytest.fixture(scope="session")
+def temp_header_file(tmp_path_factory):
+    """Create a temporary C header file for testing; shared by the session, so tests must not modify it"""
+    header = tmp_path_factory.mktemp("headers") / "temp_header.h"
+    header.write_text("""
 // Simple test header
 typedef struct Point {
     int x;
@@ -28,19 +95,14 @@ int add(int a, int b);
 void* get_data();
 const char* get_name();
 """)
-        path = f.name
-    
-    yield path
-    
-    # Cleanup
-    Path(path).unlink(missing_ok=True)
+    return str(header)
 
 
-@pytest.fixture
-def complex_header_file():
-    """Create a more complex C header file for testing"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.h', delete=False) as f:
-        f.write("""
+@pytest.fixture(scope="session")
+def complex_header_file(tmp_path_factory):
+    """Create a more complex C header file for testing; shared by the session, so tests must not modify it"""
+    header = tmp_path_factory.mktemp("headers") / "complex_header.h"
+    header.write_text("""
 // Complex test header
 typedef struct Vector3 {
     float x;
@@ -72,17 +134,14 @@ float dot_product(Vector3* a, Vector3* b);
 Matrix* get_identity_matrix();
 unsigned long long get_timestamp();
 """)
-        path = f.name
-    
-    yield path
-    
-    # Cleanup
-    Path(path).unlink(missing_ok=True)
+    return str(header)
 
 
-@pytest.fixture
-def header_with_include(tmp_path):
-    """Create header files with #include directive"""
+@pytest.fixture(scope="session")
+def header_with_include(tmp_path_factory):
+    """Create header files with #include directive; shared by the session, so tests must not modify them"""
+    tmp_path = tmp_path_factory.mktemp("header_with_include")
+
     # Create an include directory
     include_dir = tmp_path / "include"
     include_dir.mkdir()
@@ -124,11 +183,11 @@ void init_window(Window* win);
     }
 
 
-@pytest.fixture
-def opaque_types_header():
-    """Create a header with opaque types (like SDL_Window)"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.h', delete=False) as f:
-        f.write("""
+@pytest.fixture(scope="session")
+def opaque_types_header(tmp_path_factory):
+    """Create a header with opaque types (like SDL_Window); shared by the session, so tests must not modify it"""
+    header = tmp_path_factory.mktemp("headers") / "opaque_types.h"
+    header.write_text("""
 // Opaque types header (like SDL)
 typedef struct SDL_Window SDL_Window;
 typedef struct SDL_Renderer SDL_Renderer;
@@ -141,16 +200,10 @@ int SDL_SetWindowTitle(SDL_Window* window, const char* title);
 SDL_Renderer* SDL_CreateRenderer(SDL_Window* window);
 void SDL_RenderPresent(SDL_Renderer* renderer);
 """)
-        path = f.name
-    
-    yield path
-    
-    # Cleanup
-    Path(path).unlink(missing_ok=True)
+    return str(header)
 
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for testing"""
-    with tempfile.TemporaryDirectory() as dir_path:
-        yield Path(dir_path)
+def temp_dir(tmp_path):
+    """Temporary directory for testing; pytest removes old ones at the start of later sessions"""
+    return tmp_path
@@ -69,3 +69,87 @@ enum {
 // Unnamed parameters
 void unnamed_params(int, float);
 """
+
+ENABLE_FEATURE_HEADER = """
+#ifdef ENABLE_FEATURE
+int feature_enabled() { return 1; }
+#else
+int feature_enabled() { return 0; }
+#endif
+"""
+
+VERSION_DEFAULT_HEADER = """
+#define VERSION_DEFAULT 0
+#ifndef VERSION
+#define VERSION VERSION_DEFAULT
+#endif
+
+int get_version() { return VERSION; }
+"""
+
+MULTIPLE_FEATURES_HEADER = """
+#if defined(FEATURE_A) && defined(FEATURE_B)
+int both_features() { return 1; }
+#endif
+
+#ifdef FEATURE_A
+int feature_a() { return 1; }
+#endif
+
+#ifdef FEATURE_B
+int feature_b() { return 1; }
+#endif
+"""
+
+SIMPLE_FUNCTION_HEADER = """
+int simple_function() { return 0; }
+"""
+
+MYFLAGS_MYENUM_HEADER = """
+typedef enum {
+    FLAG_A = 1,
+    FLAG_B = 2,
+    FLAG_C = 4
+} MyFlags;
+
+typedef enum {
+    VALUE_A = 0,
+    VALUE_B = 1
+} MyEnum;
+"""
+
+WINDOWFLAGS_HEADER = """
+typedef enum {
+    WINDOW_FULLSCREEN = 1,
+    WINDOW_RESIZABLE = 2
+} WindowFlags;
+
+typedef enum {
+    RENDER_VSYNC = 1,
+    RENDER_HARDWARE = 2
+} RenderFlags;
+
+typedef enum {
+    OPTION_A = 0,
+    OPTION_B = 1
+} Options;
+"""
+
+PERMISSIONS_FILEMODE_HEADER = """
+typedef enum {
+    PERM_READ = 1,
+    PERM_WRITE = 2
+} Permissions;
+
+typedef enum {
+    MODE_A = 1,
+    MODE_B = 2
+} FileMode;
+"""
+
+SDL_WINDOWFLAGS_HEADER = """
+typedef enum {
+    SDL_WINDOW_FULLSCREEN = 1,
+    SDL_WINDOW_RESIZABLE = 2
+} SDL_WindowFlags;
+"""
@@ -0,0 +1,16 @@
+// <auto-generated />
+//
+// This file was automatically generated by cs-binding-generator
+// https://github.com/cs-binding-generator/cs-binding-generator
+// Generated on: <stripped>
+// Command: <stripped>
+// Do not modify this file directly
+//
+
+#nullable enable
+
+using System.Runtime.InteropServices;
+using System.Runtime.InteropServices.Marshalling;
+using System.Runtime.CompilerServices;
+
+[assembly: System.Runtime.CompilerServices.DisableRuntimeMarshalling]
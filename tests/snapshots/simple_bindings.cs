@@ -0,0 +1,57 @@
+// <auto-generated />
+//
+// This file was automatically generated by cs-binding-generator
+// https://github.com/cs-binding-generator/cs-binding-generator
+// Generated on: <stripped>
+// Command: <stripped>
+// Do not modify this file directly
+//
+
+#nullable enable
+
+using System.Runtime.InteropServices;
+using System.Runtime.InteropServices.Marshalling;
+using System.Runtime.CompilerServices;
+
+namespace Bindings;
+
+public enum Status : uint
+{
+    OK = 0,
+    ERROR = 1,
+    PENDING = 2,
+}
+
+
+[StructLayout(LayoutKind.Explicit)]
+public unsafe partial struct Point
+{
+    [FieldOffset(0)]
+    public int x;
+    [FieldOffset(4)]
+    public int y;
+}
+
+
+public static unsafe partial class NativeMethods
+{
+    [LibraryImport("testlib", EntryPoint = "add", StringMarshalling = StringMarshalling.Utf8)]
+    [UnmanagedCallConv(CallConvs = [typeof(CallConvCdecl)])]
+    public static partial int add(int a, int b);
+
+    [LibraryImport("testlib", EntryPoint = "get_data", StringMarshalling = StringMarshalling.Utf8)]
+    [UnmanagedCallConv(CallConvs = [typeof(CallConvCdecl)])]
+    public static partial nint get_data();
+
+    [LibraryImport("testlib", EntryPoint = "get_name", StringMarshalling = StringMarshalling.Utf8)]
+    [UnmanagedCallConv(CallConvs = [typeof(CallConvCdecl)])]
+    public static partial nuint get_name();
+
+    [MethodImpl(MethodImplOptions.AggressiveInlining)]
+    public static string? get_nameString()
+    {
+        var ptr = get_name();
+        return ptr == 0 ? null : Marshal.PtrToStringUTF8((nint)ptr);
+    }
+
+}
\ No newline at end of file
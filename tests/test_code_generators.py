@@ -2,125 +2,128 @@
 Unit tests for CodeGenerator and OutputBuilder
 """
 
+from dataclasses import dataclass, field
+
 import pytest
-from unittest.mock import Mock, MagicMock
 from clang.cindex import CursorKind, TypeKind
 
 from cs_binding_generator.code_generators import CodeGenerator, OutputBuilder
 from cs_binding_generator.type_mapper import TypeMapper
 
 
+@dataclass(slots=True)
+class FakeType:
+    """Minimal stand-in for clang.cindex.Type"""
+    kind: TypeKind
+    spelling: str = ""
+    variadic: bool = False
+
+    def is_function_variadic(self):
+        return self.variadic
+
+
+@dataclass(slots=True)
+class FakeCursor:
+    """Minimal stand-in for clang.cindex.Cursor; children double as function arguments"""
+    spelling: str = ""
+    kind: CursorKind | None = None
+    result_type: FakeType | None = None
+    type: FakeType | None = None
+    enum_value: int = 0
+    enum_type: FakeType = field(default_factory=lambda: FakeType(TypeKind.INT))
+    field_offset: int = 0
+    children: list = field(default_factory=list)
+
+    def get_children(self):
+        return self.children
+
+    def get_arguments(self):
+        return self.children
+
+    def get_field_offsetof(self):
+        return self.field_offset
+
+
+def fake_function(name, result_kind, result_spelling, args=()):
+    """Function declaration cursor with the given return type and arguments"""
+    return FakeCursor(
+        spelling=name,
+        kind=CursorKind.FUNCTION_DECL,
+        result_type=FakeType(result_kind, result_spelling),
+        type=FakeType(TypeKind.FUNCTIONPROTO),
+        children=list(args),
+    )
+
+
+def fake_field(name, type_kind, type_spelling, offset=0):
+    """Struct/union field cursor; offset is in bits as libclang reports it"""
+    return FakeCursor(
+        spelling=name,
+        kind=CursorKind.FIELD_DECL,
+        type=FakeType(type_kind, type_spelling),
+        field_offset=offset,
+    )
+
+
+def fake_enum_constant(name, value):
+    return FakeCursor(spelling=name, kind=CursorKind.ENUM_CONSTANT_DECL, enum_value=value)
+
+
+@pytest.fixture(scope="class")
+def code_generator():
+    """CodeGenerator shared by a test class; the methods under test don't keep per-cursor state"""
+    return CodeGenerator(TypeMapper())
+
+
 class TestCodeGenerator:
     """Test the CodeGenerator class"""
     
-    def setup_method(self):
-        """Set up test fixtures"""
-        self.type_mapper = TypeMapper()
-        self.generator = CodeGenerator(self.type_mapper)
-    
-    def test_generate_simple_function(self):
-        """Test generating a simple function with no parameters"""
-        mock_cursor = Mock()
-        mock_cursor.spelling = "get_version"
-        
-        mock_result_type = Mock()
-        mock_result_type.kind = TypeKind.INT
-        mock_result_type.spelling = "int"
-        mock_cursor.result_type = mock_result_type
-        
-        mock_cursor.get_arguments.return_value = []
-        
-        result = self.generator.generate_function(mock_cursor, "mylib")
-        
-        assert 'LibraryImport("mylib", EntryPoint = "get_version"' in result
-        assert 'StringMarshalling = StringMarshalling.Utf8' in result
-        assert 'UnmanagedCallConv(CallConvs = [typeof(CallConvCdecl)])' in result
-        assert "public static partial int get_version();" in result
+    @pytest.mark.parametrize("cursor,expected", [
+        pytest.param(
+            fake_function("get_version", TypeKind.INT, "int"),
+            [
+                'LibraryImport("mylib", EntryPoint = "get_version"',
+                'StringMarshalling = StringMarshalling.Utf8',
+                'UnmanagedCallConv(CallConvs = [typeof(CallConvCdecl)])',
+                "public static partial int get_version();",
+            ],
+            id="no_parameters",
+        ),
+        pytest.param(
+            fake_function("add", TypeKind.INT, "int", [
+                FakeCursor(spelling="a", kind=CursorKind.PARM_DECL, type=FakeType(TypeKind.INT, "int")),
+                FakeCursor(spelling="b", kind=CursorKind.PARM_DECL, type=FakeType(TypeKind.INT, "int")),
+            ]),
+            [
+                'LibraryImport("mylib", EntryPoint = "add"',
+                'StringMarshalling = StringMarshalling.Utf8',
+                "public static partial int add(int a, int b);",
+            ],
+            id="with_parameters",
+        ),
+        pytest.param(
+            fake_function("process", TypeKind.VOID, "void", [
+                FakeCursor(spelling="", kind=CursorKind.PARM_DECL, type=FakeType(TypeKind.INT, "int")),
+            ]),
+            ["void process(int param0);"],
+            id="unnamed_parameter",
+        ),
+    ])
+    def test_generate_function(self, code_generator, cursor, expected):
+        """Test generating LibraryImport declarations for functions"""
+        result = code_generator.generate_function(cursor, "mylib")
+        
+        for snippet in expected:
+            assert snippet in result
     
-    def test_generate_function_with_parameters(self):
-        """Test generating a function with parameters"""
-        mock_cursor = Mock()
-        mock_cursor.spelling = "add"
-        
-        mock_result_type = Mock()
-        mock_result_type.kind = TypeKind.INT
-        mock_result_type.spelling = "int"
-        mock_cursor.result_type = mock_result_type
-        
-        # Create mock arguments
-        arg1 = Mock()
-        arg1.spelling = "a"
-        arg1_type = Mock()
-        arg1_type.kind = TypeKind.INT
-        arg1_type.spelling = "int"
-        arg1.type = arg1_type
-        
-        arg2 = Mock()
-        arg2.spelling = "b"
-        arg2_type = Mock()
-        arg2_type.kind = TypeKind.INT
-        arg2_type.spelling = "int"
-        arg2.type = arg2_type
-        
-        mock_cursor.get_arguments.return_value = [arg1, arg2]
-        
-        result = self.generator.generate_function(mock_cursor, "mylib")
-        
-        assert 'LibraryImport("mylib", EntryPoint = "add"' in result
-        assert 'StringMarshalling = StringMarshalling.Utf8' in result
-        assert "public static partial int add(int a, int b);" in result
-    
-    def test_generate_function_unnamed_parameter(self):
-        """Test generating a function with unnamed parameters"""
-        mock_cursor = Mock()
-        mock_cursor.spelling = "process"
-        
-        mock_result_type = Mock()
-        mock_result_type.kind = TypeKind.VOID
-        mock_result_type.spelling = "void"
-        mock_cursor.result_type = mock_result_type
-        
-        # Create mock argument with no name
-        arg1 = Mock()
-        arg1.spelling = ""  # Unnamed parameter
-        arg1_type = Mock()
-        arg1_type.kind = TypeKind.INT
-        arg1_type.spelling = "int"
-        arg1.type = arg1_type
-        
-        mock_cursor.get_arguments.return_value = [arg1]
-        
-        result = self.generator.generate_function(mock_cursor, "mylib")
-        
-        assert "void process(int param0);" in result
-    
-    def test_generate_struct_simple(self):
+    def test_generate_struct_simple(self, code_generator):
         """Test generating a simple struct"""
-        mock_cursor = Mock()
-        mock_cursor.spelling = "Point"
-        
-        # Create mock fields
-        field1 = Mock()
-        field1.kind = CursorKind.FIELD_DECL
-        field1.spelling = "x"
-        field1_type = Mock()
-        field1_type.kind = TypeKind.INT
-        field1_type.spelling = "int"
-        field1.type = field1_type
-        field1.get_field_offsetof.return_value = 0  # offset in bits
+        cursor = FakeCursor(spelling="Point", kind=CursorKind.STRUCT_DECL, children=[
+            fake_field("x", TypeKind.INT, "int", offset=0),
+            fake_field("y", TypeKind.INT, "int", offset=32),  # 4 bytes * 8
+        ])
         
-        field2 = Mock()
-        field2.kind = CursorKind.FIELD_DECL
-        field2.spelling = "y"
-        field2_type = Mock()
-        field2_type.kind = TypeKind.INT
-        field2_type.spelling = "int"
-        field2.type = field2_type
-        field2.get_field_offsetof.return_value = 32  # offset in bits (4 bytes * 8)
-        
-        mock_cursor.get_children.return_value = [field1, field2]
-        
-        result = self.generator.generate_struct(mock_cursor)
+        result = code_generator.generate_struct(cursor)
         
         assert "[StructLayout(LayoutKind.Explicit)]" in result
         assert "public unsafe partial struct Point" in result
@@ -129,45 +132,14 @@ class TestCodeGenerator:
         assert "public int x;" in result
         assert "public int y;" in result
     
-    def test_generate_struct_empty(self):
-        """Test that empty struct returns empty string"""
-        mock_cursor = Mock()
-        mock_cursor.spelling = "EmptyStruct"
-        mock_cursor.get_children.return_value = []
-        
-        result = self.generator.generate_struct(mock_cursor)
-        
-        assert result == ""
-    
-
-    
-    def test_generate_union_simple(self):
+    def test_generate_union_simple(self, code_generator):
         """Test generating a simple union"""
-        mock_cursor = Mock()
-        mock_cursor.spelling = "Data"
-        
-        # Create mock fields
-        field1 = Mock()
-        field1.kind = CursorKind.FIELD_DECL
-        field1.spelling = "as_int"
-        field1_type = Mock()
-        field1_type.kind = TypeKind.INT
-        field1_type.spelling = "int"
-        field1.type = field1_type
-        field1.get_field_offsetof.return_value = -1  # unions return -1
-        
-        field2 = Mock()
-        field2.kind = CursorKind.FIELD_DECL
-        field2.spelling = "as_float"
-        field2_type = Mock()
-        field2_type.kind = TypeKind.FLOAT
-        field2_type.spelling = "float"
-        field2.type = field2_type
-        field2.get_field_offsetof.return_value = -1  # unions return -1
+        cursor = FakeCursor(spelling="Data", kind=CursorKind.UNION_DECL, children=[
+            fake_field("as_int", TypeKind.INT, "int", offset=-1),  # unions return -1
+            fake_field("as_float", TypeKind.FLOAT, "float", offset=-1),
+        ])
         
-        mock_cursor.get_children.return_value = [field1, field2]
-        
-        result = self.generator.generate_union(mock_cursor)
+        result = code_generator.generate_union(cursor)
         
         assert "[StructLayout(LayoutKind.Explicit)]" in result
         assert "public unsafe partial struct Data" in result
@@ -176,166 +148,126 @@ class TestCodeGenerator:
         assert "public int as_int;" in result
         assert "public float as_float;" in result
     
-    def test_generate_union_empty(self):
-        """Test that empty union returns empty string"""
-        mock_cursor = Mock()
-        mock_cursor.spelling = "EmptyUnion"
-        mock_cursor.get_children.return_value = []
-        
-        result = self.generator.generate_union(mock_cursor)
-        
-        assert result == ""
-    
-    def test_generate_enum_simple(self):
-        """Test generating a simple enum"""
-        mock_cursor = Mock()
-        mock_cursor.spelling = "Status"
-        
-        # Create mock enum constants
-        const1 = Mock()
-        const1.kind = CursorKind.ENUM_CONSTANT_DECL
-        const1.spelling = "OK"
-        const1.enum_value = 0
-        
-        const2 = Mock()
-        const2.kind = CursorKind.ENUM_CONSTANT_DECL
-        const2.spelling = "ERROR"
-        const2.enum_value = 1
-        
-        mock_cursor.get_children.return_value = [const1, const2]
-        
-        result = self.generator.generate_enum(mock_cursor)
-        
-        assert "public enum Status" in result
-        assert "OK = 0," in result
-        assert "ERROR = 1," in result
-    
-    def test_generate_enum_anonymous(self):
-        """Test generating an anonymous enum"""
-        mock_cursor = Mock()
-        mock_cursor.spelling = ""  # Anonymous
-        
-        const1 = Mock()
-        const1.kind = CursorKind.ENUM_CONSTANT_DECL
-        const1.spelling = "VALUE1"
-        const1.enum_value = 100
-        
-        mock_cursor.get_children.return_value = [const1]
-        
-        result = self.generator.generate_enum(mock_cursor)
-        
-        # Single-member enum should derive name from the member
-        assert "public enum VALUE1" in result
-        assert "VALUE1 = 100," in result
-    
-    def test_generate_enum_empty(self):
-        """Test that empty enum returns empty string"""
-        mock_cursor = Mock()
-        mock_cursor.spelling = "EmptyEnum"
-        mock_cursor.get_children.return_value = []
-        
-        result = self.generator.generate_enum(mock_cursor)
-        
-        assert result == ""
-    
-    def test_generate_enum_with_inheritance(self):
-        """Test generating enum with underlying type inheritance"""
-        from clang.cindex import TypeKind
-        
-        mock_cursor = Mock()
-        mock_cursor.spelling = "ByteStatus"
-        
-        # Mock underlying type
-        mock_underlying_type = Mock()
-        mock_underlying_type.kind = TypeKind.UCHAR
-        mock_cursor.enum_type = mock_underlying_type
-        
-        # Create mock enum constants
-        const1 = Mock()
-        const1.kind = CursorKind.ENUM_CONSTANT_DECL
-        const1.spelling = "OK"
-        const1.enum_value = 0
-        
-        const2 = Mock()
-        const2.kind = CursorKind.ENUM_CONSTANT_DECL
-        const2.spelling = "ERROR"
-        const2.enum_value = 1
-        
-        mock_cursor.get_children.return_value = [const1, const2]
-        
-        result = self.generator.generate_enum(mock_cursor)
-        
-        assert "public enum ByteStatus : byte" in result
-        assert "OK = 0," in result
-        assert "ERROR = 1," in result
+    @pytest.mark.parametrize("method,kind", [
+        ("generate_struct", CursorKind.STRUCT_DECL),
+        ("generate_union", CursorKind.UNION_DECL),
+        ("generate_enum", CursorKind.ENUM_DECL),
+    ], ids=["struct", "union", "enum"])
+    def test_generate_empty_declaration(self, code_generator, method, kind):
+        """Test that declarations without members produce no output"""
+        cursor = FakeCursor(spelling="Empty", kind=kind)
+        
+        assert getattr(code_generator, method)(cursor) == ""
     
-    def test_generate_enum_int_no_inheritance(self):
-        """Test that int enums don't show inheritance clause"""
-        from clang.cindex import TypeKind
-        
-        mock_cursor = Mock()
-        mock_cursor.spelling = "IntStatus"
-        
-        # Mock int underlying type (default)
-        mock_underlying_type = Mock()
-        mock_underlying_type.kind = TypeKind.INT
-        mock_cursor.enum_type = mock_underlying_type
-        
-        const1 = Mock()
-        const1.kind = CursorKind.ENUM_CONSTANT_DECL
-        const1.spelling = "OK"
-        const1.enum_value = 0
-        
-        mock_cursor.get_children.return_value = [const1]
-        
-        result = self.generator.generate_enum(mock_cursor)
-        
-        # Should not have inheritance clause for int
-        assert "public enum IntStatus\n{" in result
-        assert ": int" not in result
+    @pytest.mark.parametrize("cursor,expected,unexpected", [
+        pytest.param(
+            FakeCursor(spelling="Status", kind=CursorKind.ENUM_DECL, children=[
+                fake_enum_constant("OK", 0),
+                fake_enum_constant("ERROR", 1),
+            ]),
+            ["public enum Status", "OK = 0,", "ERROR = 1,"],
+            [],
+            id="simple",
+        ),
+        pytest.param(
+            # Single-member anonymous enum should derive name from the member
+            FakeCursor(spelling="", kind=CursorKind.ENUM_DECL, children=[fake_enum_constant("VALUE1", 100)]),
+            ["public enum VALUE1", "VALUE1 = 100,"],
+            [],
+            id="anonymous",
+        ),
+        pytest.param(
+            FakeCursor(
+                spelling="ByteStatus",
+                kind=CursorKind.ENUM_DECL,
+                enum_type=FakeType(TypeKind.UCHAR),
+                children=[fake_enum_constant("OK", 0), fake_enum_constant("ERROR", 1)],
+            ),
+            ["public enum ByteStatus : byte", "OK = 0,", "ERROR = 1,"],
+            [],
+            id="with_inheritance",
+        ),
+        pytest.param(
+            # int is the default underlying type, so no inheritance clause
+            FakeCursor(
+                spelling="IntStatus",
+                kind=CursorKind.ENUM_DECL,
+                enum_type=FakeType(TypeKind.INT),
+                children=[fake_enum_constant("OK", 0)],
+            ),
+            ["public enum IntStatus\n{"],
+            [": int"],
+            id="int_no_inheritance",
+        ),
+    ])
+    def test_generate_enum(self, code_generator, cursor, expected, unexpected):
+        """Test generating C# enums"""
+        result = code_generator.generate_enum(cursor)
+        
+        for snippet in expected:
+            assert snippet in result
+        for snippet in unexpected:
+            assert snippet not in result
 
 
 class TestOutputBuilder:
     """Test the OutputBuilder class"""
     
-    def test_build_complete_output(self):
-        """Test building complete C# output"""
-        enums = ['public enum Status\n{\n    OK = 0,\n}\n']
-        structs = ['[StructLayout(LayoutKind.Explicit)]\npublic partial struct Point\n{\n    [FieldOffset(0)]\n    public int x;\n}\n']
-        functions = ['    [LibraryImport("mylib")]\n    public static partial int add(int a, int b);\n']
-        
+    @pytest.mark.parametrize("namespace,enums,structs,functions,class_name,expected", [
+        pytest.param(
+            "MyApp.Bindings",
+            ['public enum Status\n{\n    OK = 0,\n}\n'],
+            ['[StructLayout(LayoutKind.Explicit)]\npublic partial struct Point\n{\n    [FieldOffset(0)]\n    public int x;\n}\n'],
+            ['    [LibraryImport("mylib")]\n    public static partial int add(int a, int b);\n'],
+            "NativeMethods",
+            [
+                "using System.Runtime.InteropServices;",
+                "using System.Runtime.InteropServices.Marshalling;",
+                "namespace MyApp.Bindings;",
+                "public enum Status",
+                "public partial struct Point",
+                "public static unsafe partial class NativeMethods",
+                "public static partial int add(int a, int b);",
+            ],
+            id="complete",
+        ),
+        pytest.param(
+            "Test",
+            [],
+            [],
+            ['    [LibraryImport("lib")]\n    public static partial void init();\n'],
+            None,  # default class name
+            [
+                "namespace Test;",
+                "public static unsafe partial class NativeMethods",
+                "public static partial void init();",
+            ],
+            id="functions_only",
+        ),
+        pytest.param(
+            "Test",
+            [],
+            [],
+            ['    [LibraryImport("lib")]\n    public static partial void test();\n'],
+            "CustomNative",
+            ["public static unsafe partial class CustomNative"],
+            id="custom_class_name",
+        ),
+    ])
+    def test_build_output(self, namespace, enums, structs, functions, class_name, expected):
+        """Test building C# output from generated declarations"""
+        kwargs = {"class_name": class_name} if class_name is not None else {}
         result = OutputBuilder.build(
-            namespace="MyApp.Bindings",
+            namespace=namespace,
             enums=enums,
             structs=structs,
             unions=[],
             functions=functions,
-            class_name="NativeMethods"
+            **kwargs
         )
         
-        assert "using System.Runtime.InteropServices;" in result
-        assert "using System.Runtime.InteropServices.Marshalling;" in result
-        assert "namespace MyApp.Bindings;" in result
-        assert "public enum Status" in result
-        assert "public partial struct Point" in result
-        assert "public static unsafe partial class NativeMethods" in result
-        assert "public static partial int add(int a, int b);" in result
-    
-    def test_build_minimal_output(self):
-        """Test building output with only functions"""
-        functions = ['    [LibraryImport("lib")]\n    public static partial void init();\n']
-        
-        result = OutputBuilder.build(
-            namespace="Test",
-            enums=[],
-            structs=[],
-            unions=[],
-            functions=functions
-        )
-        
-        assert "namespace Test;" in result
-        assert "public static unsafe partial class NativeMethods" in result
-        assert "public static partial void init();" in result
+        for snippet in expected:
+            assert snippet in result
     
     def test_build_empty_output(self):
         """Test building output with no content (no namespace for empty files)"""
@@ -352,18 +284,3 @@ class TestOutputBuilder:
         assert "public static partial class" not in result
         # Should still have assembly attribute
         assert "DisableRuntimeMarshalling" in result
-    
-    def test_build_custom_class_name(self):
-        """Test using custom class name for native methods"""
-        functions = ['    [LibraryImport("lib")]\n    public static partial void test();\n']
-        
-        result = OutputBuilder.build(
-            namespace="Test",
-            enums=[],
-            structs=[],
-            unions=[],
-            functions=functions,
-            class_name="CustomNative"
-        )
-        
-        assert "public static unsafe partial class CustomNative" in result
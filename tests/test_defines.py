@@ -1,10 +1,15 @@
 """Tests for compiler defines feature"""
 
+from types import SimpleNamespace
+
 import pytest
 from cs_binding_generator.config import parse_config_file, BindingConfig
 from cs_binding_generator.generator import CSharpBindingsGenerator
 
+from tests import fixtures
+
 
+@pytest.mark.parser_only
 class TestDefinesXMLParsing:
     """Test parsing of define elements from XML configuration"""
 
@@ -112,25 +117,53 @@ class TestDefinesXMLParsing:
         assert len(config.global_defines) == 1
         assert config.global_defines[0] == ("EMPTY", "")
 
+    def test_parse_many_defines(self, tmp_path):
+        """Test parsing a config with many define elements"""
+        config_file = tmp_path / "config.xml"
+        defines = "".join(f'    <define name="DEFINE_{i}" value="{i}"/>\n' for i in range(10000))
+        config_file.write_text(f"""
+<bindings>
+{defines}    <library name="testlib">
+        <include file="/tmp/test.h"/>
+    </library>
+</bindings>
+        """)
 
+        config = parse_config_file(str(config_file))
+
+        assert config.global_defines == [(f"DEFINE_{i}", str(i)) for i in range(10000)]
+        assert config.header_library_pairs == [("/tmp/test.h", "testlib")]
+
+
+DEFINE_HEADERS = {
+    "feature_enabled": fixtures.ENABLE_FEATURE_HEADER,
+    "get_version": fixtures.VERSION_DEFAULT_HEADER,
+    "multiple_features": fixtures.MULTIPLE_FEATURES_HEADER,
+    "simple_function": fixtures.SIMPLE_FUNCTION_HEADER,
+}
+
+
+@pytest.fixture(scope="module")
+def define_headers(tmp_path_factory):
+    """Write the headers used by the code generation tests once; attributes are their paths"""
+    header_dir = tmp_path_factory.mktemp("define_headers")
+    paths = {}
+    for name, content in DEFINE_HEADERS.items():
+        header_file = header_dir / f"{name}.h"
+        header_file.write_text(content)
+        paths[name] = str(header_file)
+    return SimpleNamespace(**paths)
+
+
+@pytest.mark.codegen
 class TestDefinesCodeGeneration:
     """Test that defines are correctly applied during code generation"""
 
-    def test_define_without_value_applied(self, temp_header_file, tmp_path):
+    def test_define_without_value_applied(self, define_headers, tmp_path):
         """Test that define without value generates -D flag"""
-        header_content = """
-#ifdef ENABLE_FEATURE
-int feature_enabled() { return 1; }
-#else
-int feature_enabled() { return 0; }
-#endif
-        """
-        from pathlib import Path
-        Path(temp_header_file).write_text(header_content)
-
         generator = CSharpBindingsGenerator()
         result = generator.generate(
-            [(temp_header_file, "testlib")],
+            [(define_headers.feature_enabled, "testlib")],
             output=str(tmp_path),
             global_defines=[("ENABLE_FEATURE", None)],
         )
@@ -138,22 +171,11 @@ int feature_enabled() { return 0; }
         # Should generate binding for feature_enabled function
         assert "feature_enabled" in result["testlib.cs"]
 
-    def test_define_with_value_applied(self, temp_header_file, tmp_path):
+    def test_define_with_value_applied(self, define_headers, tmp_path):
         """Test that define with value generates -D flag with value"""
-        header_content = """
-#define VERSION_DEFAULT 0
-#ifndef VERSION
-#define VERSION VERSION_DEFAULT
-#endif
-
-int get_version() { return VERSION; }
-        """
-        from pathlib import Path
-        Path(temp_header_file).write_text(header_content)
-
         generator = CSharpBindingsGenerator()
         result = generator.generate(
-            [(temp_header_file, "testlib")],
+            [(define_headers.get_version, "testlib")],
             output=str(tmp_path),
             global_defines=[("VERSION", "42")],
         )
@@ -161,27 +183,11 @@ int get_version() { return VERSION; }
         # Should generate binding for get_version function
         assert "get_version" in result["testlib.cs"]
 
-    def test_multiple_defines_applied(self, temp_header_file, tmp_path):
+    def test_multiple_defines_applied(self, define_headers, tmp_path):
         """Test that multiple defines are all applied"""
-        header_content = """
-#if defined(FEATURE_A) && defined(FEATURE_B)
-int both_features() { return 1; }
-#endif
-
-#ifdef FEATURE_A
-int feature_a() { return 1; }
-#endif
-
-#ifdef FEATURE_B
-int feature_b() { return 1; }
-#endif
-        """
-        from pathlib import Path
-        Path(temp_header_file).write_text(header_content)
-
         generator = CSharpBindingsGenerator()
         result = generator.generate(
-            [(temp_header_file, "testlib")],
+            [(define_headers.multiple_features, "testlib")],
             output=str(tmp_path),
             global_defines=[("FEATURE_A", None), ("FEATURE_B", None)],
         )
@@ -191,57 +197,42 @@ int feature_b() { return 1; }
         assert "feature_a" in code
         assert "feature_b" in code
 
-    def test_no_defines_default_behavior(self, temp_header_file, tmp_path):
+    def test_no_defines_default_behavior(self, define_headers, tmp_path):
         """Test that generation works without defines"""
-        header_content = """
-int simple_function() { return 0; }
-        """
-        from pathlib import Path
-        Path(temp_header_file).write_text(header_content)
-
         generator = CSharpBindingsGenerator()
         result = generator.generate(
-            [(temp_header_file, "testlib")],
+            [(define_headers.simple_function, "testlib")],
             output=str(tmp_path),
             global_defines=[],
         )
 
         assert "simple_function" in result["testlib.cs"]
 
-    def test_defines_apply_to_all_libraries(self, temp_header_file, tmp_path):
+    def test_defines_apply_to_all_libraries(self, tmp_path):
         """Test that global defines apply to all libraries"""
-        import tempfile
-        from pathlib import Path
-        
-        # Create two separate header files
-        with tempfile.NamedTemporaryFile(mode='w', suffix='_lib1.h', delete=False) as f1:
-            f1.write("""
+        # Headers are passed in memory; nothing is written to disk
+        header_file1 = str(tmp_path / "test_lib1.h")
+        header_file2 = str(tmp_path / "test_lib2.h")
+        unsaved_files = {
+            header_file1: """
 #ifdef GLOBAL_FLAG
 int lib1_function() { return 1; }
 #endif
-            """)
-            header_file1 = f1.name
-
-        with tempfile.NamedTemporaryFile(mode='w', suffix='_lib2.h', delete=False) as f2:
-            f2.write("""
+""",
+            header_file2: """
 #ifdef GLOBAL_FLAG
 int lib2_function() { return 2; }
 #endif
-            """)
-            header_file2 = f2.name
-
-        try:
-            generator = CSharpBindingsGenerator()
-            result = generator.generate(
-                [(header_file1, "lib1"), (header_file2, "lib2")],
-                output=str(tmp_path),
-                global_defines=[("GLOBAL_FLAG", None)],
-            )
-
-            assert "lib1_function" in result["lib1.cs"]
-            assert "lib2_function" in result["lib2.cs"]
-        finally:
-            import os
-            os.unlink(header_file1)
-            os.unlink(header_file2)
+""",
+        }
+
+        generator = CSharpBindingsGenerator()
+        result = generator.generate(
+            [(header_file1, "lib1"), (header_file2, "lib2")],
+            output=str(tmp_path),
+            global_defines=[("GLOBAL_FLAG", None)],
+            unsaved_files=unsaved_files,
+        )
 
+        assert "lib1_function" in result["lib1.cs"]
+        assert "lib2_function" in result["lib2.cs"]
@@ -2,8 +2,6 @@
 Test edge cases and regression tests for complex scenarios encountered during development.
 """
 
-import tempfile
-from pathlib import Path
 import pytest
 
 from cs_binding_generator.config import parse_config_file, BindingConfig
@@ -3,8 +3,6 @@ Test error handling and edge cases for improved coverage
 """
 
 import pytest
-import tempfile
-from pathlib import Path
 from unittest.mock import Mock, patch
 import clang.cindex
 
@@ -13,6 +11,21 @@ from cs_binding_generator.type_mapper import TypeMapper
 from cs_binding_generator.code_generators import CodeGenerator
 
 
+@pytest.fixture(scope="module")
+def include_chain(tmp_path_factory):
+    """Chain of headers each including the next, written once per module"""
+    chain_dir = tmp_path_factory.mktemp("include_chain")
+    headers = []
+    for i in range(10):  # Deep nesting
+        header = chain_dir / f"level{i}.h"
+        if i < 9:
+            header.write_text(f'#include "level{i+1}.h"\nint level{i}_func();')
+        else:
+            header.write_text(f"int level{i}_func();")
+        headers.append(header)
+    return chain_dir, headers
+
+
 class TestErrorHandling:
     """Test error handling scenarios"""
     
@@ -77,6 +90,38 @@ class TestErrorHandling:
         assert not generator._is_system_header("/usr/include/freetype2/freetype.h")
         assert not generator._is_system_header("/home/user/myproject/header.h")
     
+    def test_system_header_detection_cached_per_path(self, monkeypatch):
+        """Test that each path is resolved only once however often it is checked"""
+        generator = CSharpBindingsGenerator()
+        checked = []
+        check = generator._check_system_header
+        monkeypatch.setattr(generator, "_check_system_header", lambda path: checked.append(path) or check(path))
+
+        for _ in range(3):
+            assert generator._is_system_header("/usr/include/stdio.h")
+            assert not generator._is_system_header("/home/user/myproject/header.h")
+
+        assert checked == ["/usr/include/stdio.h", "/home/user/myproject/header.h"]
+
+    def test_system_header_cache_cleared_each_generate(self, temp_dir, monkeypatch):
+        """Test that system header classifications are not carried over from an earlier generate() call"""
+        header = temp_dir / "plain.h"
+        header.write_text("int plain_func(int a);")
+        generator = CSharpBindingsGenerator()
+        checked = []
+        check = generator._check_system_header
+        monkeypatch.setattr(generator, "_check_system_header", lambda path: checked.append(path) or check(path))
+
+        link = temp_dir / "include"
+        link.symlink_to(temp_dir)
+        assert not generator._is_system_header(str(link / "config.h"))
+
+        link.unlink()
+        link.symlink_to("/usr/include/sys")
+        generator.generate([(str(header), "testlib")], output=None)
+        assert generator._is_system_header(str(link / "config.h"))
+        assert checked.count(str(link / "config.h")) == 2
+    
     def test_empty_header_generates_minimal_output(self, temp_dir):
         """Test that empty header generates valid but minimal output"""
         generator = CSharpBindingsGenerator()
@@ -328,22 +373,16 @@ class TestTypeMapperEdgeCases:
 class TestCLIArguments:
     """Test CLI argument validation and edge cases"""
     
-    def test_invalid_input_format_missing_colon(self, capsys, tmp_path):
+    def test_invalid_input_format_missing_colon(self, capsys, tmp_path, run_cli):
         """Test CLI requires config file (explicit or default)"""
-        import subprocess
-
-        result = subprocess.run([
-            "python", "-m", "cs_binding_generator.main",
-            "-o", str(tmp_path)
-        ], capture_output=True, text=True, cwd=str(tmp_path))
+        result = run_cli("-o", str(tmp_path), cwd=str(tmp_path))
 
         assert result.returncode != 0
-        assert "No config file specified and default 'cs-bindings.xml' not found" in result.stderr
+        err = result.stderr.decode("utf-8", "replace")
+        assert "No config file specified and default 'cs-bindings.xml' not found" in err
     
-    def test_multiple_include_directories(self, temp_dir):
+    def test_multiple_include_directories(self, temp_dir, run_cli):
         """Test CLI with many include directories"""
-        import subprocess
-        
         # Create multiple include directories
         includes = []
         for i in range(5):
@@ -368,12 +407,11 @@ class TestCLIArguments:
         output_dir = temp_dir / "output"
         output_dir.mkdir()
         
-        result = subprocess.run([
-            "python", "-m", "cs_binding_generator.main",
+        result = run_cli(
             "-C", str(config),
             "-o", str(output_dir),
             *includes
-        ], capture_output=True, text=True)
+        )
         
         # Should handle many include directories without issues
         assert result.returncode == 0
@@ -408,35 +446,33 @@ class TestMemoryAndPerformance:
         assert "VALUE_0 = 0," in result
         assert "VALUE_999 = 999," in result
     
-    def test_deeply_nested_includes(self, temp_dir):
+    def test_deeply_nested_includes(self, include_chain, tmp_path, translation_unit_cache):
         """Test deeply nested include structure"""
-        generator = CSharpBindingsGenerator()
-        
-        # Create chain of includes
-        headers = []
-        for i in range(10):  # Deep nesting
-            header = temp_dir / f"level{i}.h"
-            if i < 9:
-                header.write_text(f'#include "level{i+1}.h"\nint level{i}_func();')
-            else:
-                header.write_text(f"int level{i}_func();")
-            headers.append(header)
+        chain_dir, headers = include_chain
+        generator = CSharpBindingsGenerator(translation_units=translation_unit_cache)
         
         # Should handle deep includes without stack overflow
         output = generator.generate(
             [(str(headers[0]), "testlib")],
-            output=str(temp_dir),
-            include_dirs=[str(temp_dir)]
+            output=str(tmp_path),
+            include_dirs=[str(chain_dir)]
         )
         
         assert "testlib.cs" in output
         assert "namespace Bindings;" in output["testlib.cs"]
-    
-    @pytest.fixture
-    def temp_dir(self):
-        """Fixture for temporary directory"""
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            yield Path(tmp_dir)
+
+    def test_deeply_nested_includes_reuses_translation_unit(self, include_chain, tmp_path):
+        """Test that regenerating the same include chain reparses the cached translation unit"""
+        chain_dir, headers = include_chain
+        generator = CSharpBindingsGenerator()
+        pairs = [(str(headers[0]), "testlib")]
+
+        first = generator.generate(pairs, output=str(tmp_path), include_dirs=[str(chain_dir)])
+        ((tu, _),) = generator.translation_units.values()
+        second = generator.generate(pairs, output=str(tmp_path), include_dirs=[str(chain_dir)])
+
+        assert [cached_tu for cached_tu, _ in generator.translation_units.values()] == [tu]
+        assert first == second
     
     @pytest.fixture 
     def temp_header_file(self, temp_dir):
@@ -1,11 +1,56 @@
 """Tests for flag enum feature"""
 
+import re
+from types import SimpleNamespace
+
 import pytest
-from pathlib import Path
-from cs_binding_generator.config import parse_config_file
-from cs_binding_generator.generator import CSharpBindingsGenerator
+from cs_binding_generator.config import BindingConfig, parse_config_file
+from cs_binding_generator.type_mapper import TypeMapper
+
+from tests import fixtures
+
+
+_GENERATED_ENUM_RE = re.compile(r"(\[Flags\]\n)?\w+ enum (\w+)(?: : \w+)?\n\{\n(.*?)\n\}", re.S)
+
+
+def parse_generated(output):
+    """Collect the enums in generated C# in one pass: name -> (flags, member names)"""
+    return {
+        match.group(2): SimpleNamespace(
+            flags=match.group(1) is not None,
+            values=re.findall(r"^\s+(\w+) =", match.group(3), re.M),
+        )
+        for match in _GENERATED_ENUM_RE.finditer(output)
+    }
+
+
+def make_config(header, flag_enums, renames=()):
+    """Build the BindingConfig a single-library flags config would parse to, without an XML round-trip"""
+    return BindingConfig(
+        header_library_pairs=[(str(header), "testlib")],
+        flag_enums=list(flag_enums),
+        renames=list(renames),
+        library_namespaces={"testlib": "Test"},
+    )
 
 
+def generate_with_config(generator, config, output_dir, unsaved_files=None):
+    """Apply renames and flag patterns from config the way the CLI does, then generate"""
+    for from_name, to_name, is_regex in config.renames:
+        generator.type_mapper.add_rename(from_name, to_name, is_regex)
+    for pattern, is_regex in config.flag_enums:
+        generator.type_mapper.add_flag_enum(pattern, is_regex)
+
+    return generator.generate(
+        config.header_library_pairs,
+        output=str(output_dir),
+        library_namespaces=config.library_namespaces,
+        include_dirs=[str(output_dir)],
+        unsaved_files=unsaved_files,
+    )
+
+
+@pytest.mark.parser_only
 class TestFlagEnumsXMLParsing:
     """Test parsing of flags elements from XML configuration"""
 
@@ -80,201 +125,73 @@ class TestFlagEnumsXMLParsing:
             parse_config_file(str(config_file))
 
 
-class TestFlagEnumsCodeGeneration:
-    """Test that flag enums are generated with [Flags] attribute"""
-
-    def test_exact_match_flag_enum(self, temp_dir):
-        """Test that exact match adds [Flags] attribute"""
-        header = temp_dir / "test.h"
-        header.write_text("""
-            typedef enum {
-                FLAG_A = 1,
-                FLAG_B = 2,
-                FLAG_C = 4
-            } MyFlags;
-            
-            typedef enum {
-                VALUE_A = 0,
-                VALUE_B = 1
-            } MyEnum;
-        """)
-
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <flags pattern="MyFlags"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
-
-        config = parse_config_file(str(config))
-        
-        generator = CSharpBindingsGenerator()
-        for pattern, is_regex in config.flag_enums:
-            generator.type_mapper.add_flag_enum(pattern, is_regex)
-        
-        result = generator.generate(
-            config.header_library_pairs,
-            output=str(temp_dir),
-            library_namespaces=config.library_namespaces,
-            include_dirs=[str(temp_dir)]
-        )
-
-        output = result["testlib.cs"]
-        
-        # MyFlags should have [Flags] attribute
-        assert "[Flags]" in output
-        assert "[Flags]\npublic enum MyFlags" in output
-        
-        # MyEnum should NOT have [Flags] attribute
-        lines = output.split('\n')
-        for i, line in enumerate(lines):
-            if 'enum MyEnum' in line:
-                # Check that the previous line is not [Flags]
-                assert i == 0 or '[Flags]' not in lines[i-1]
-
-    def test_regex_flag_enum(self, temp_dir):
-        """Test that regex pattern adds [Flags] attribute"""
-        header = temp_dir / "test.h"
-        header.write_text("""
-            typedef enum {
-                WINDOW_FULLSCREEN = 1,
-                WINDOW_RESIZABLE = 2
-            } WindowFlags;
-            
-            typedef enum {
-                RENDER_VSYNC = 1,
-                RENDER_HARDWARE = 2
-            } RenderFlags;
-            
-            typedef enum {
-                OPTION_A = 0,
-                OPTION_B = 1
-            } Options;
-        """)
-
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <flags pattern="(.*)Flags" regex="true"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
-
-        config = parse_config_file(str(config))
-        
-        generator = CSharpBindingsGenerator()
-        for pattern, is_regex in config.flag_enums:
-            generator.type_mapper.add_flag_enum(pattern, is_regex)
-        
-        result = generator.generate(
-            config.header_library_pairs,
-            output=str(temp_dir),
-            library_namespaces=config.library_namespaces,
-            include_dirs=[str(temp_dir)]
-        )
-
-        output = result["testlib.cs"]
-        
-        # Both *Flags enums should have [Flags] attribute
-        assert output.count("[Flags]") == 2
-        assert "[Flags]\npublic enum WindowFlags" in output
-        assert "[Flags]\npublic enum RenderFlags" in output
-        
-        # Options should NOT have [Flags] attribute
-        lines = output.split('\n')
-        for i, line in enumerate(lines):
-            if 'enum Options' in line:
-                # Check that the previous line is not [Flags]
-                assert i == 0 or '[Flags]' not in lines[i-1]
-
-    def test_multiple_flag_patterns(self, temp_dir):
-        """Test multiple flag patterns (first match wins)"""
-        header = temp_dir / "test.h"
-        header.write_text("""
-            typedef enum {
-                PERM_READ = 1,
-                PERM_WRITE = 2
-            } Permissions;
-            
-            typedef enum {
-                MODE_A = 1,
-                MODE_B = 2
-            } FileMode;
-        """)
+class TestFlagEnumMatching:
+    """Test matching enum names against flag patterns"""
 
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <flags pattern="Permissions"/>
-                <flags pattern="(.*)Mode" regex="true"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+    def test_exact_and_regex_patterns(self):
+        """Test that exact names and regex patterns are both matched in full"""
+        mapper = TypeMapper()
+        mapper.add_flag_enum("Permissions")
+        mapper.add_flag_enum("(.*)Flags", is_regex=True)
+        mapper.add_flag_enum("Mode_[A-Z]+", is_regex=True)
 
-        config = parse_config_file(str(config))
-        
-        generator = CSharpBindingsGenerator()
-        for pattern, is_regex in config.flag_enums:
-            generator.type_mapper.add_flag_enum(pattern, is_regex)
-        
-        result = generator.generate(
-            config.header_library_pairs,
-            output=str(temp_dir),
-            library_namespaces=config.library_namespaces,
-            include_dirs=[str(temp_dir)]
-        )
+        assert mapper.is_flag_enum("Permissions")
+        assert mapper.is_flag_enum("WindowFlags")
+        assert mapper.is_flag_enum("Mode_RW")
+        assert not mapper.is_flag_enum("PermissionsEx")
+        assert not mapper.is_flag_enum("WindowFlagsEx")
+        assert not mapper.is_flag_enum("Mode_rw")
+        assert mapper.flag_enums == [("Permissions", False), ("(.*)Flags", True), ("Mode_[A-Z]+", True)]
 
-        output = result["testlib.cs"]
-        
-        # Both should have [Flags] attribute
-        assert output.count("[Flags]") == 2
-        assert "[Flags]\npublic enum Permissions" in output
-        assert "[Flags]\npublic enum FileMode" in output
-
-    def test_flag_enum_with_rename(self, temp_dir):
-        """Test that flag enum works after rename"""
-        header = temp_dir / "test.h"
-        header.write_text("""
-            typedef enum {
-                SDL_WINDOW_FULLSCREEN = 1,
-                SDL_WINDOW_RESIZABLE = 2
-            } SDL_WindowFlags;
-        """)
 
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <rename from="SDL_WindowFlags" to="WindowFlags"/>
-                <flags pattern="WindowFlags"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
-
-        config = parse_config_file(str(config))
-        
-        generator = CSharpBindingsGenerator()
-        for from_name, to_name, is_regex in config.renames:
-            generator.type_mapper.add_rename(from_name, to_name, is_regex)
-        for pattern, is_regex in config.flag_enums:
-            generator.type_mapper.add_flag_enum(pattern, is_regex)
-        
-        result = generator.generate(
-            config.header_library_pairs,
-            output=str(temp_dir),
-            library_namespaces=config.library_namespaces,
-            include_dirs=[str(temp_dir)]
-        )
+@pytest.mark.codegen
+class TestFlagEnumsCodeGeneration:
+    """Test that flag enums are generated with [Flags] attribute"""
 
-        output = result["testlib.cs"]
-        
-        # Should have [Flags] on the renamed enum
-        assert "[Flags]\npublic enum WindowFlags" in output
+    @pytest.mark.parametrize("header_content,flag_enums,renames,expected_flags,expected_plain", [
+        pytest.param(
+            fixtures.MYFLAGS_MYENUM_HEADER,
+            [("MyFlags", False)],
+            [],
+            ["MyFlags"],
+            ["MyEnum"],
+            id="exact_match",
+        ),
+        pytest.param(
+            fixtures.WINDOWFLAGS_HEADER,
+            [("(.*)Flags", True)],
+            [],
+            ["WindowFlags", "RenderFlags"],
+            ["Options"],
+            id="regex",
+        ),
+        pytest.param(
+            fixtures.PERMISSIONS_FILEMODE_HEADER,
+            [("Permissions", False), ("(.*)Mode", True)],
+            [],
+            ["Permissions", "FileMode"],
+            [],
+            id="multiple_patterns",
+        ),
+        pytest.param(
+            fixtures.SDL_WINDOWFLAGS_HEADER,
+            [("WindowFlags", False)],
+            [("SDL_WindowFlags", "WindowFlags", False)],
+            ["WindowFlags"],
+            [],
+            id="after_rename",
+        ),
+    ])
+    def test_flag_enum_generation(
+        self, generator, tmp_path, header_content, flag_enums, renames, expected_flags, expected_plain
+    ):
+        """Test that enums matching a flags pattern, and only those, get the [Flags] attribute"""
+        header = tmp_path / "test.h"
+        config = make_config(header, flag_enums=flag_enums, renames=renames)
+        output = generate_with_config(generator, config, tmp_path, unsaved_files={str(header): header_content})["testlib.cs"]
+        enums = parse_generated(output)
+
+        assert sorted(name for name, enum in enums.items() if enum.flags) == sorted(expected_flags)
+        for name in expected_plain:
+            assert enums[name].flags is False
+            assert enums[name].values
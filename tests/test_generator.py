@@ -2,92 +2,84 @@
 Integration tests for CSharpBindingsGenerator
 """
 
+import os
+import re
+
 import pytest
 from pathlib import Path
 
-from cs_binding_generator.generator import CSharpBindingsGenerator
+from cs_binding_generator.generator import CSharpBindingsGenerator, GeneratorDiagnostic
+
+
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+
+# Header lines that change from run to run
+_VOLATILE_HEADER_RE = re.compile(r"^// (Generated on|Command): .*$", re.M)
+
+
+def normalize_generated(output):
+    """Blank out the timestamp and command line so generated output can be compared to a snapshot"""
+    return _VOLATILE_HEADER_RE.sub(r"// \1: <stripped>", output)
+
+
+def assert_contains_all(text, needles):
+    """Assert that text contains every string in needles, reporting all missing ones together"""
+    missing = [needle for needle in needles if needle not in text]
+    assert not missing, f"missing: {missing}"
 
 
 class TestCSharpBindingsGenerator:
     """Test the main CSharpBindingsGenerator class"""
     
-    def test_generate_from_simple_header(self, temp_header_file, tmp_path):
+    def test_generate_from_simple_header(self, temp_header_file, tmp_path, generator):
         """Test generating bindings from a simple header file"""
         output_dir = tmp_path / "output"
-        generator = CSharpBindingsGenerator()
         result = generator.generate([(temp_header_file, "testlib")], output=str(output_dir))
         
         # Should return a dict of filename -> content
         assert isinstance(result, dict)
         assert "testlib.cs" in result
-        
-        output = result["testlib.cs"]
-        
-        # Check basic structure
-        assert "namespace Bindings;" in output  # Default namespace since no library namespace specified
-        assert "using System.Runtime.InteropServices;" in output
-        assert "#nullable enable" in output  # Should always have nullable directive
-        
-        # Check enum generation
-        assert "public enum Status" in output
-        assert "OK = 0," in output
-        assert "ERROR = 1," in output
-        assert "PENDING = 2," in output
-        
-        # Check struct generation
-        assert "public unsafe partial struct Point" in output
-        assert "public int x;" in output
-        assert "public int y;" in output
-        
-        # Check function generation
-        assert "public static partial int add(int a, int b);" in output
-        assert "public static partial nint get_data();" in output
-        assert "public static partial nuint get_name();" in output  # char* return -> nuint
-        
-        # Check LibraryImport attributes
-        assert '[LibraryImport("testlib"' in output
+
+        # The whole file must match the checked-in golden output
+        expected = (SNAPSHOT_DIR / "simple_bindings.cs").read_text()
+        assert normalize_generated(result["testlib.cs"]) == expected
     
-    def test_generate_from_complex_header(self, complex_header_file, tmp_path):
+    def test_generate_from_complex_header(self, complex_header_file, generator):
         """Test generating bindings from a complex header file"""
-        output_dir = tmp_path / "output"
-        generator = CSharpBindingsGenerator()
-        result = generator.generate([(complex_header_file, "nativelib")], output=str(output_dir))
+        result = generator.generate([(complex_header_file, "nativelib")], output=None)
         
         assert isinstance(result, dict)
         assert "nativelib.cs" in result
         
         output = result["nativelib.cs"]
         
-        # Check namespace (default since no library namespace specified)
-        assert "namespace Bindings;" in output
-        
-        # Check enums
-        assert "public enum Color" in output
-        assert "RED = 16711680," in output  # 0xFF0000
-        assert "GREEN = 65280," in output   # 0x00FF00
-        assert "BLUE = 255," in output      # 0x0000FF
-        
-        assert "public enum BuildMode" in output
-        assert "MODE_NORMAL" in output
-        assert "MODE_DEBUG" in output
-        assert "MODE_RELEASE" in output
-        
-        # Check structs
-        assert "public unsafe partial struct Vector3" in output
-        assert "public float x;" in output
-        assert "public float y;" in output
-        assert "public float z;" in output
-        
-        # Check functions
-        assert "public static partial void init_engine(string? config_path);" in output
-        assert "public static partial Vector3* create_vector(float x, float y, float z);" in output
-        assert "public static partial void destroy_vector(Vector3* vec);" in output
-        assert "public static partial float dot_product(Vector3* a, Vector3* b);" in output
-        assert "public static partial ulong get_timestamp();" in output
+        assert_contains_all(output, [
+            # Namespace (default since no library namespace specified)
+            "namespace Bindings;",
+            # Enums
+            "public enum Color",
+            "RED = 16711680,",  # 0xFF0000
+            "GREEN = 65280,",   # 0x00FF00
+            "BLUE = 255,",      # 0x0000FF
+            "public enum BuildMode",
+            "MODE_NORMAL",
+            "MODE_DEBUG",
+            "MODE_RELEASE",
+            # Structs
+            "public unsafe partial struct Vector3",
+            "public float x;",
+            "public float y;",
+            "public float z;",
+            # Functions
+            "public static partial void init_engine(string? config_path);",
+            "public static partial Vector3* create_vector(float x, float y, float z);",
+            "public static partial void destroy_vector(Vector3* vec);",
+            "public static partial float dot_product(Vector3* a, Vector3* b);",
+            "public static partial ulong get_timestamp();",
+        ])
     
-    def test_generate_to_file(self, temp_header_file, tmp_path):
+    def test_generate_to_file(self, temp_header_file, tmp_path, generator):
         """Test generating bindings to an output directory"""
-        generator = CSharpBindingsGenerator()
         output_dir = tmp_path / "output"
         
         result = generator.generate([(temp_header_file, "testlib")], output=str(output_dir))
@@ -109,12 +101,20 @@ class TestCSharpBindingsGenerator:
         assert "namespace Bindings;" in content
         assert "public unsafe partial struct Point" in content
     
-    def test_generate_multiple_headers(self, temp_header_file, complex_header_file, tmp_path):
+    def test_generate_without_output_writes_nothing(self, temp_header_file, tmp_path, monkeypatch, capsys, generator):
+        """Test that output=None returns the generated files without writing them"""
+        monkeypatch.chdir(tmp_path)
+        result = generator.generate([(temp_header_file, "testlib")], output=None)
+
+        assert set(result) == {"bindings.cs", "testlib.cs"}
+        assert list(tmp_path.iterdir()) == []
+        assert "Generated" not in capsys.readouterr().out
+
+    def test_generate_multiple_headers(self, temp_header_file, complex_header_file, generator):
         """Test generating bindings from multiple header files"""
-        generator = CSharpBindingsGenerator()
         result = generator.generate(
             [(temp_header_file, "testlib"), (complex_header_file, "nativelib")],
-            output=str(tmp_path / "output"),
+            output=None,
             library_namespaces={"testlib": "Combined", "nativelib": "Combined"}
         )
         
@@ -123,18 +123,141 @@ class TestCSharpBindingsGenerator:
         assert "testlib.cs" in result
         assert "nativelib.cs" in result
         
-        # Combine all output for checking
-        output = "\n".join(result.values())
-        
-        # Should contain elements from both headers
-        assert "public unsafe partial struct Point" in output
-        assert "public unsafe partial struct Vector3" in output
-        assert "public enum Status" in output
-        assert "public enum Color" in output
-        assert "public static partial int add(int a, int b);" in output
-        assert "public static partial void init_engine(string? config_path);" in output
+        # Each header's declarations land in its own library's file
+        assert_contains_all(result["testlib.cs"], [
+            "public unsafe partial struct Point",
+            "public enum Status",
+            "public static partial int add(int a, int b);",
+        ])
+        assert_contains_all(result["nativelib.cs"], [
+            "public unsafe partial struct Vector3",
+            "public enum Color",
+            "public static partial void init_engine(string? config_path);",
+        ])
     
-    def test_generate_nonexistent_file(self, capsys, tmp_path):
+    def test_inline_function_bodies_are_skipped(self, tmp_path):
+        """Test that inline functions are bound from their prototype without their bodies being parsed"""
+        header = tmp_path / "inline.h"
+        header.write_text("""
+            static inline int inline_func(int a) { return undeclared_helper(a) + undeclared_value; }
+            int plain_func(int a);
+        """)
+
+        generator = CSharpBindingsGenerator()
+        result = generator.generate([(str(header), "testlib")], output=str(tmp_path / "output"))
+
+        assert "public static partial int inline_func(int a);" in result["testlib.cs"]
+        assert "public static partial int plain_func(int a);" in result["testlib.cs"]
+        ((tu, _),) = generator.translation_units.values()
+        assert not any("undeclared" in diag.spelling for diag in tu.diagnostics)
+    
+    def test_generators_share_default_index(self, tmp_path):
+        """Test that generators created without an index parse through one shared index, and clear_cache drops their TUs"""
+        header = tmp_path / "shared.h"
+        header.write_text("int shared_func(int a);")
+
+        first = CSharpBindingsGenerator()
+        second = CSharpBindingsGenerator()
+        first.generate([(str(header), "testlib")], output=str(tmp_path / "out1"))
+        second.generate([(str(header), "testlib")], output=str(tmp_path / "out2"))
+
+        ((first_tu, _),) = first.translation_units.values()
+        ((second_tu, _),) = second.translation_units.values()
+        assert first_tu.index is second_tu.index
+
+        first.clear_cache()
+        assert first.translation_units == {}
+        first.generate([(str(header), "testlib")], output=str(tmp_path / "out3"))
+        ((reparsed_tu, _),) = first.translation_units.values()
+        assert reparsed_tu is not first_tu
+    
+    def test_generate_many_headers_in_input_order(self, capsys, tmp_path):
+        """Test that headers parsed concurrently are still processed in the given order"""
+        pairs = []
+        for i in range(6):
+            header = tmp_path / f"lib{i}.h"
+            header.write_text(f"int lib{i}_func(int a);")
+            pairs.append((str(header), f"lib{i}"))
+
+        generator = CSharpBindingsGenerator()
+        result = generator.generate(pairs, output=str(tmp_path / "output"))
+
+        for i in range(6):
+            assert f"lib{i}_func" in result[f"lib{i}.cs"]
+        processed = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Processing:")]
+        assert processed == [f"Processing: {header} -> {library}" for header, library in pairs]
+    
+    def test_single_header_parsed_without_thread_pool(self, tmp_path, monkeypatch):
+        """Test that a single header is parsed inline with the generator's index, without starting worker threads"""
+        from cs_binding_generator import generator as generator_module
+
+        def fail_pool():
+            raise AssertionError("thread pool used for a single header")
+
+        monkeypatch.setattr(generator_module, "_parse_pool", fail_pool)
+
+        header = tmp_path / "single.h"
+        header.write_text("int single_func(int a);")
+        generator = CSharpBindingsGenerator()
+        result = generator.generate([(str(header), "testlib")], output=str(tmp_path / "output"))
+
+        assert "single_func" in result["testlib.cs"]
+        ((tu, _),) = generator.translation_units.values()
+        assert tu.index is generator_module._shared_index()
+
+    def test_explicit_index_used_for_several_headers(self, tmp_path):
+        """Test that a generator given an index parses every header with it rather than with the pool's indexes"""
+        import clang.cindex
+
+        pairs = []
+        for i in range(2):
+            header = tmp_path / f"lib{i}.h"
+            header.write_text(f"int lib{i}_func(int a);")
+            pairs.append((str(header), f"lib{i}"))
+
+        index = clang.cindex.Index.create()
+        generator = CSharpBindingsGenerator(index=index)
+        result = generator.generate(pairs, output=None)
+
+        assert "lib0_func" in result["lib0.cs"]
+        assert "lib1_func" in result["lib1.cs"]
+        assert [tu.index is index for tu, _ in generator.translation_units.values()] == [True, True]
+
+    def test_parse_pool_indexes_reused_across_runs(self, temp_header_file, complex_header_file, monkeypatch, generator):
+        """Test that repeated multi-header runs reuse the parse pool's per-thread indexes"""
+        import clang.cindex
+
+        created = []
+        create = clang.cindex.Index.create
+        monkeypatch.setattr(clang.cindex.Index, "create", lambda *args, **kwargs: created.append(1) or create(*args, **kwargs))
+
+        pool_size = os.cpu_count() or 1
+        for _ in range(pool_size + 1):
+            result = generator.generate([(temp_header_file, "testlib"), (complex_header_file, "nativelib")], output=None)
+            assert "public unsafe partial struct Vector3" in result["nativelib.cs"]
+
+        # At most one index per pool thread, however many runs there were
+        assert len(created) <= pool_size
+
+    def test_system_header_declarations_skipped_but_typedefs_resolved(self, tmp_path):
+        """Test that declarations from system headers are not generated while their typedefs still resolve"""
+        # stdint.h is treated as a system header by name
+        (tmp_path / "stdint.h").write_text("""
+            typedef unsigned int my_u32;
+            struct sys_struct { int a; };
+            int sys_func(int a);
+        """)
+        header = tmp_path / "user.h"
+        header.write_text('#include "stdint.h"\nint user_func(my_u32 value);\n')
+
+        generator = CSharpBindingsGenerator()
+        output = generator.generate([(str(header), "testlib")], output=str(tmp_path / "output"))["testlib.cs"]
+
+        assert "public static partial int user_func(uint value);" in output
+        assert "sys_func" not in output
+        assert "sys_struct" not in output
+
+    def test_generate_nonexistent_file(self, tmp_path):
         """Test handling of nonexistent header files"""
         generator = CSharpBindingsGenerator()
         
@@ -145,11 +268,10 @@ class TestCSharpBindingsGenerator:
         assert "Header file not found" in str(excinfo.value)
         assert "/nonexistent/file.h" in str(excinfo.value)
         
-        # Should print error message
-        captured = capsys.readouterr()
-        assert "Error: Header file not found" in captured.err
+        # Should report the error
+        assert generator.diagnostics == [GeneratorDiagnostic("error", "/nonexistent/file.h", "Header file not found")]
     
-    def test_generate_nonexistent_file_with_ignore_missing(self, capsys, tmp_path):
+    def test_generate_nonexistent_file_with_ignore_missing(self, tmp_path):
         """Test handling of nonexistent header files with ignore_missing=True"""
         generator = CSharpBindingsGenerator()
         result = generator.generate([("/nonexistent/file.h", "testlib")], output=str(tmp_path / "output"), ignore_missing=True)
@@ -159,62 +281,54 @@ class TestCSharpBindingsGenerator:
         assert "bindings.cs" in result
         assert len(result) == 1  # Only the assembly bindings file
         
-        # Should print warning
-        captured = capsys.readouterr()
-        assert "Warning: Header file not found" in captured.err
+        # Should report a warning
+        assert generator.diagnostics == [GeneratorDiagnostic("warning", "/nonexistent/file.h", "Header file not found")]
     
-    def test_generate_mixed_existing_nonexistent_files(self, temp_header_file, capsys, tmp_path):
+    def test_generate_mixed_existing_nonexistent_files(self, temp_header_file, generator):
         """Test handling mix of existing and nonexistent files"""
-        generator = CSharpBindingsGenerator()
         
         # Should fail by default if ANY file is missing
         with pytest.raises(FileNotFoundError):
-            generator.generate([(temp_header_file, "testlib"), ("/nonexistent/file.h", "testlib")], output=str(tmp_path / "output"))
+            generator.generate([(temp_header_file, "testlib"), ("/nonexistent/file.h", "testlib")], output=None)
         
         # Should succeed with ignore_missing=True, processing only valid files
-        result = generator.generate([(temp_header_file, "testlib"), ("/nonexistent/file.h", "testlib")], output=str(tmp_path / "output2"), ignore_missing=True)
+        result = generator.generate([(temp_header_file, "testlib"), ("/nonexistent/file.h", "testlib")], output=None, ignore_missing=True)
         assert isinstance(result, dict)
         assert "testlib.cs" in result
         output = result["testlib.cs"]
         assert "public unsafe partial struct Point" in output
-        
-        captured = capsys.readouterr()
-        assert "Warning: Header file not found" in captured.err
+        assert generator.diagnostics == [GeneratorDiagnostic("warning", "/nonexistent/file.h", "Header file not found")]
     
-    def test_custom_namespace(self, temp_header_file, tmp_path):
+    def test_custom_namespace(self, temp_header_file, generator):
         """Test using custom namespace"""
-        generator = CSharpBindingsGenerator()
-        result = generator.generate([(temp_header_file, "testlib")], output=str(tmp_path / "output"), library_namespaces={"testlib": "My.Custom.Namespace"})
+        result = generator.generate([(temp_header_file, "testlib")], output=None, library_namespaces={"testlib": "My.Custom.Namespace"})
         
         assert isinstance(result, dict)
         assert "testlib.cs" in result
         output = result["testlib.cs"]
         assert "namespace My.Custom.Namespace;" in output
     
-    def test_default_namespace(self, temp_header_file, tmp_path):
+    def test_default_namespace(self, temp_header_file, generator):
         """Test default namespace when not specified"""
-        generator = CSharpBindingsGenerator()
-        result = generator.generate([(temp_header_file, "testlib")], output=str(tmp_path / "output"))
+        result = generator.generate([(temp_header_file, "testlib")], output=None)
         
         assert isinstance(result, dict)
         assert "testlib.cs" in result
         output = result["testlib.cs"]
         assert "namespace Bindings;" in output
     
-    def test_library_name_in_attributes(self, temp_header_file, tmp_path):
+    def test_library_name_in_attributes(self, temp_header_file, generator):
         """Test that library name appears correctly in LibraryImport attributes"""
-        generator = CSharpBindingsGenerator()
-        result = generator.generate([(temp_header_file, "my_custom_lib")], output=str(tmp_path / "output"))
+        result = generator.generate([(temp_header_file, "my_custom_lib")], output=None)
         
         assert isinstance(result, dict)
         assert "my_custom_lib.cs" in result
         output = result["my_custom_lib.cs"]
         assert '[LibraryImport("my_custom_lib"' in output
     
-    def test_struct_layout_attribute(self, temp_header_file, tmp_path):
+    def test_struct_layout_attribute(self, temp_header_file, generator):
         """Test that structs have StructLayout attribute"""
-        generator = CSharpBindingsGenerator()
-        result = generator.generate([(temp_header_file, "testlib")], output=str(tmp_path / "output"))
+        result = generator.generate([(temp_header_file, "testlib")], output=None)
         
         assert isinstance(result, dict)
         assert "testlib.cs" in result
@@ -222,12 +336,11 @@ class TestCSharpBindingsGenerator:
         assert "[StructLayout(LayoutKind.Explicit)]" in output
         assert "[FieldOffset(" in output
     
-    def test_generate_with_include_dirs(self, header_with_include, tmp_path):
+    def test_generate_with_include_dirs(self, header_with_include, generator):
         """Test generating bindings with include directories"""
-        generator = CSharpBindingsGenerator()
         output = generator.generate(
             [(header_with_include['main'], "testlib")],
-            output=str(tmp_path),
+            output=None,
             include_dirs=[header_with_include['include_dir']],
             library_namespaces={"testlib": "Test"}
         )
@@ -242,7 +355,7 @@ class TestCSharpBindingsGenerator:
         # Config struct is in included file, so won't be generated
         # (only main file content is processed, but types are resolved)
     
-    def test_generate_without_include_dirs_fails(self, header_with_include, tmp_path, capsys):
+    def test_generate_without_include_dirs_fails(self, header_with_include, tmp_path):
         """Test that parsing fails immediately with fatal errors when include directories are missing"""
         generator = CSharpBindingsGenerator()
         # Don't provide include_dirs - should have fatal parse errors
@@ -261,9 +374,85 @@ class TestCSharpBindingsGenerator:
         assert "Check include directories" in error_msg
         assert "common.h" in error_msg  # The missing include file
         
-        # Check for errors in stderr
-        captured = capsys.readouterr()
-        assert "common.h' file not found" in captured.err
+        # The missing include is reported as a fatal diagnostic for the main header
+        assert any(
+            diagnostic.level == "fatal" and diagnostic.path == header_with_include['main'] and "common.h' file not found" in diagnostic.message
+            for diagnostic in generator.diagnostics
+        )
+
+    def test_regenerate_reparses_changed_header(self, tmp_path):
+        """Test that a cached translation unit picks up header changes on the next run"""
+        header = tmp_path / "changing.h"
+        header.write_text("int first_func(int a);")
+
+        generator = CSharpBindingsGenerator()
+        first = generator.generate([(str(header), "testlib")], output=str(tmp_path / "out1"))
+        assert "first_func" in first["testlib.cs"]
+
+        header.write_text("int second_func(int a);")
+        second = generator.generate([(str(header), "testlib")], output=str(tmp_path / "out2"))
+        assert "second_func" in second["testlib.cs"]
+        assert "first_func" not in second["testlib.cs"]
+        assert len(generator.translation_units) == 1
+
+    def test_regenerate_skips_reparse_of_unchanged_header(self, tmp_path, monkeypatch):
+        """Test that generating an unchanged header again reuses the parse without reparsing"""
+        import clang.cindex
+
+        header = tmp_path / "stable.h"
+        header.write_text("int stable_func(int a);")
+
+        reparses = []
+        original_reparse = clang.cindex.TranslationUnit.reparse
+        monkeypatch.setattr(
+            clang.cindex.TranslationUnit, "reparse",
+            lambda tu, *args, **kwargs: reparses.append(tu) or original_reparse(tu, *args, **kwargs),
+        )
+
+        generator = CSharpBindingsGenerator()
+        first = generator.generate([(str(header), "testlib")], output=str(tmp_path / "out1"))
+        second = generator.generate([(str(header), "testlib")], output=str(tmp_path / "out2"))
+        assert first == second
+        assert reparses == []
+
+        header.write_text("int stable_func(int a, int b);")
+        third = generator.generate([(str(header), "testlib")], output=str(tmp_path / "out3"))
+        assert len(reparses) == 1
+        assert "int b" in third["testlib.cs"]
+
+    def test_shared_cache_reparses_after_other_generator_changed_it(self, tmp_path):
+        """Test that a generator does not trust its own last parse once another generator reparsed the shared TU"""
+        header = tmp_path / "shared_changing.h"
+        header.write_text("int foo(int a);")
+        pairs = [(str(header), "testlib")]
+
+        translation_units = {}
+        first = CSharpBindingsGenerator(translation_units=translation_units)
+        second = CSharpBindingsGenerator(translation_units=translation_units)
+        assert "foo" in first.generate(pairs, output=None)["testlib.cs"]
+
+        header.write_text("int bar(int a);")
+        assert "bar" in second.generate(pairs, output=None)["testlib.cs"]
+
+        header.write_text("int foo(int a);")
+        result = first.generate(pairs, output=None)["testlib.cs"]
+        assert "public static partial int foo(int a);" in result
+        assert "bar" not in result
+
+
+@pytest.fixture(scope="module")
+def graphics_header(tmp_path_factory):
+    """Header for a second library, written once for the module; tests must not modify it"""
+    header = tmp_path_factory.mktemp("headers") / "header2.h"
+    header.write_text('''
+            typedef enum {
+                GRAPHICS_OK = 0,
+                GRAPHICS_ERROR = 1
+            } GraphicsStatus;
+            
+            int draw_line(int x1, int y1, int x2, int y2);
+        ''')
+    return str(header)
 
 
 class TestGeneratorInternals:
@@ -289,41 +478,75 @@ class TestGeneratorInternals:
         # Should still have assembly attribute
         assert "DisableRuntimeMarshalling" in output
     
+    def test_import_does_not_load_libclang(self):
+        """Test that importing the package and building output leaves the libclang shared library unloaded"""
+        import subprocess
+        import sys
+
+        script = (
+            "import clang.cindex\n"
+            "from cs_binding_generator import CSharpBindingsGenerator, OutputBuilder\n"
+            "OutputBuilder.build(namespace='Empty', enums=[], structs=[], unions=[], functions=[])\n"
+            "CSharpBindingsGenerator()\n"
+            "assert not clang.cindex.Config.loaded\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True, cwd=Path(__file__).parent.parent)
+    
+    def test_construction_does_not_create_index(self, monkeypatch):
+        """Test that creating a generator is cheap: no libclang index is made until generate() needs one"""
+        import clang.cindex
+
+        def fail_create(*args, **kwargs):
+            raise AssertionError("Index.create() called during construction")
+
+        monkeypatch.setattr(clang.cindex.Index, "create", staticmethod(fail_create))
+
+        generators = [CSharpBindingsGenerator() for _ in range(20)]
+        assert all(generator.index is None for generator in generators)
+    
+    def test_system_include_paths_queried_once(self, tmp_path, monkeypatch):
+        """Test that clang is asked for its system include paths once, not on every generate()"""
+        import subprocess
+        from cs_binding_generator import generator as generator_module
+
+        calls = []
+        original_run = subprocess.run
+        monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: calls.append(args) or original_run(*args, **kwargs))
+        generator_module._system_include_args.cache_clear()
+
+        header = tmp_path / "test.h"
+        header.write_text("int func(int a);")
+        generator = CSharpBindingsGenerator()
+        generator.generate([(str(header), "testlib")], output=str(tmp_path))
+        generator.generate([(str(header), "testlib")], output=str(tmp_path))
+
+        assert len(calls) == 1
+    
     def test_opaque_types_with_pointers(self, opaque_types_header, tmp_path):
         """Test that opaque types generate proper pointer types (SDL_Window*)"""
         generator = CSharpBindingsGenerator()
         output = generator.generate([(opaque_types_header, "testlib")], output=str(tmp_path), library_namespaces={"testlib": "SDL"})
         
-        # Check that opaque types are generated as structs (not readonly)
-        assert "public partial struct SDL_Window" in output["testlib.cs"]
-        assert "public partial struct SDL_Renderer" in output["testlib.cs"]
-        
-        # Check that functions use typed pointers (SDL_Window*) instead of nint
-        assert "public static partial SDL_Window* SDL_CreateWindow" in output["testlib.cs"]
-        assert "public static partial void SDL_DestroyWindow(SDL_Window* window);" in output["testlib.cs"]
-        assert "public static partial nuint SDL_GetWindowTitle(SDL_Window* window);" in output["testlib.cs"]
-        assert "public static partial int SDL_SetWindowTitle(SDL_Window* window, string? title);" in output["testlib.cs"]
-        assert "public static partial SDL_Renderer* SDL_CreateRenderer(SDL_Window* window);" in output["testlib.cs"]
-        assert "public static partial void SDL_RenderPresent(SDL_Renderer* renderer);" in output["testlib.cs"]
+        assert_contains_all(output["testlib.cs"], [
+            # Opaque types are generated as structs (not readonly)
+            "public partial struct SDL_Window",
+            "public partial struct SDL_Renderer",
+            # Functions use typed pointers (SDL_Window*) instead of nint
+            "public static partial SDL_Window* SDL_CreateWindow",
+            "public static partial void SDL_DestroyWindow(SDL_Window* window);",
+            "public static partial nuint SDL_GetWindowTitle(SDL_Window* window);",
+            "public static partial int SDL_SetWindowTitle(SDL_Window* window, string? title);",
+            "public static partial SDL_Renderer* SDL_CreateRenderer(SDL_Window* window);",
+            "public static partial void SDL_RenderPresent(SDL_Renderer* renderer);",
+        ])
     
-    def test_multi_file_generation(self, temp_dir, temp_header_file):
+    def test_multi_file_generation(self, temp_dir, temp_header_file, graphics_header, translation_unit_cache):
         """Test generating multiple files when multi_file=True"""
-        generator = CSharpBindingsGenerator()
-        
-        # Create a second header file for another library
-        header2_path = temp_dir / "header2.h"
-        header2_path.write_text('''
-            typedef enum {
-                GRAPHICS_OK = 0,
-                GRAPHICS_ERROR = 1
-            } GraphicsStatus;
-            
-            int draw_line(int x1, int y1, int x2, int y2);
-        ''')
+        generator = CSharpBindingsGenerator(translation_units=translation_unit_cache)
         
         # Generate with multi-file output to temp directory
         result = generator.generate(
-            [(temp_header_file, "testlib"), (header2_path, "graphics")], 
+            [(temp_header_file, "testlib"), (graphics_header, "graphics")], 
             output=str(temp_dir),
             library_namespaces={"testlib": "Test", "graphics": "Test"}
         )
@@ -353,9 +576,9 @@ class TestGeneratorInternals:
         assert "enum Status" not in graphics_content
         assert "add(int a, int b)" not in graphics_content
     
-    def test_single_file_vs_multi_file_content_consistency(self, temp_dir, temp_header_file, tmp_path):
+    def test_single_file_vs_multi_file_content_consistency(self, temp_header_file, tmp_path, translation_unit_cache):
         """Test that multi-file generation works correctly"""
-        generator = CSharpBindingsGenerator()
+        generator = CSharpBindingsGenerator(translation_units=translation_unit_cache)
         
         # Generate multi file output
         multi_output = generator.generate(
@@ -366,43 +589,24 @@ class TestGeneratorInternals:
         
         # Multi output should have bindings.cs and testlib.cs
         assert isinstance(multi_output, dict)
-        assert len(multi_output) == 2
-        assert "bindings.cs" in multi_output
-        assert "testlib.cs" in multi_output
-        
-        # Check that bindings.cs contains assembly attributes (but no namespace)
-        bindings_content = multi_output["bindings.cs"]
-        assert "[assembly: System.Runtime.CompilerServices.DisableRuntimeMarshalling]" in bindings_content
-        # bindings.cs should not have namespace since it only contains assembly attributes
-        assert "namespace Bindings;" not in bindings_content
-        
-        # Check that testlib.cs contains the actual bindings
-        testlib_content = multi_output["testlib.cs"]
-        assert "namespace Test;" in testlib_content
-        assert "public enum Status" in testlib_content
-        assert "public unsafe partial struct Point" in testlib_content
-        assert "public static partial int add(int a, int b);" in testlib_content
-        assert '[LibraryImport("testlib"' in testlib_content
+        assert sorted(multi_output) == ["bindings.cs", "testlib.cs"]
+        
+        # bindings.cs only carries the assembly attributes, with no namespace
+        expected_bindings = (SNAPSHOT_DIR / "assembly_bindings.cs").read_text()
+        assert normalize_generated(multi_output["bindings.cs"]) == expected_bindings
+        
+        # testlib.cs holds the same bindings as the simple header snapshot, in the library's namespace
+        expected_testlib = (SNAPSHOT_DIR / "simple_bindings.cs").read_text().replace("namespace Bindings;", "namespace Test;", 1)
+        assert normalize_generated(multi_output["testlib.cs"]) == expected_testlib
     
-    def test_multi_file_generation_with_custom_class_names(self, temp_dir, temp_header_file, tmp_path):
+    def test_multi_file_generation_with_custom_class_names(self, temp_header_file, graphics_header, tmp_path, translation_unit_cache):
         """Test multi-file generation with custom class names"""
-        generator = CSharpBindingsGenerator()
-        
-        # Create a second header file
-        header2_path = temp_dir / "header2.h"
-        header2_path.write_text('''
-            typedef enum {
-                GRAPHICS_OK = 0,
-                GRAPHICS_ERROR = 1
-            } GraphicsStatus;
-            
-            int draw_line(int x1, int y1, int x2, int y2);
-        ''')
+        generator = CSharpBindingsGenerator(translation_units=translation_unit_cache)
         
         # Generate with custom class names
         library_class_names = {"testlib": "CustomTestLib", "graphics": "CustomGraphics"}
         result = generator.generate(
-            [(temp_header_file, "testlib"), (header2_path, "graphics")], 
+            [(temp_header_file, "testlib"), (graphics_header, "graphics")], 
             output=str(tmp_path),
             library_namespaces={"testlib": "Test", "graphics": "Test"},
             library_class_names=library_class_names
@@ -509,6 +713,60 @@ class TestGeneratorInternals:
         assert "FLAG_B = unchecked((uint)(0x02))," in testlib_content
         assert "FLAG_C = unchecked((uint)(0x04))," in testlib_content
 
+    def test_generate_with_constants_from_unsaved_file(self, tmp_path):
+        """Test that constants are extracted from headers passed in memory"""
+        header = str(tmp_path / "unsaved_macros.h")
+        unsaved_files = {header: """
+            #define FLAG_A 0x01
+            #define FLAG_B 0x02
+
+            int test_func(int flags);
+        """}
+
+        generator = CSharpBindingsGenerator()
+        result = generator.generate(
+            [(header, "testlib")],
+            output=str(tmp_path / "output"),
+            global_constants=[("Flags", "FLAG_.*", "uint", False)],
+            unsaved_files=unsaved_files,
+        )
+
+        testlib_content = result["testlib.cs"]
+        assert "test_func" in testlib_content
+        assert "FLAG_A = unchecked((uint)(0x01))," in testlib_content
+        assert "FLAG_B = unchecked((uint)(0x02))," in testlib_content
+        assert not (tmp_path / "unsaved_macros.h").exists()
+
+    def test_constants_from_shared_header_scanned_once(self, temp_dir, monkeypatch):
+        """Test that a header included by several libraries is scanned for macros only once per run"""
+        shared_header = temp_dir / "shared_flags.h"
+        shared_header.write_text("""
+            #define FLAG_A 0x01
+            #define FLAG_B 0x02
+        """)
+        lib1_header = temp_dir / "lib1.h"
+        lib1_header.write_text(f'#include "{shared_header}"\nint lib1_func(int flags);\n')
+        lib2_header = temp_dir / "lib2.h"
+        lib2_header.write_text(f'#include "{shared_header}"\nint lib2_func(int flags);\n')
+
+        generator = CSharpBindingsGenerator()
+        scanned = []
+        extract = generator._extract_macros_from_file
+        monkeypatch.setattr(
+            generator, "_extract_macros_from_file", lambda path, patterns: scanned.append(path) or extract(path, patterns)
+        )
+
+        result = generator.generate(
+            [(str(lib1_header), "lib1"), (str(lib2_header), "lib2")],
+            output=None,
+            global_constants=[("Flags", "FLAG_.*", "uint", False)],
+        )
+
+        assert scanned.count(str(shared_header)) == 1
+        for library in ("lib1", "lib2"):
+            assert "FLAG_A = unchecked((uint)(0x01))," in result[f"{library}.cs"]
+            assert "FLAG_B = unchecked((uint)(0x02))," in result[f"{library}.cs"]
+
     def test_generate_with_constants_negative_value(self, temp_dir, tmp_path):
         """Test that negative values in unsigned enums are wrapped with unchecked cast"""
         # Create a header with a negative macro value (like SDL_WINDOW_SURFACE_VSYNC_ADAPTIVE)
@@ -872,7 +1130,7 @@ class TestGeneratorInternals:
         assert "[FieldOffset(8)]" in val_i_offset
 
 
-def test_struct_with_bool_array(temp_header_file, tmp_path):
+def test_struct_with_bool_array(tmp_path):
     """Test that bool arrays in structs are mapped to byte arrays to ensure unmanaged structs"""
     header_content = """
     #include <stdbool.h>
@@ -886,11 +1144,12 @@ def test_struct_with_bool_array(temp_header_file, tmp_path):
     // Function taking pointer to struct - would cause CS8500 if struct is managed
     void processBoolArray(TestBoolArray* data);
     """
-    Path(temp_header_file).write_text(header_content)
+    header_file = tmp_path / "bool_array.h"
+    header_file.write_text(header_content)
 
     output_dir = tmp_path / "output"
     generator = CSharpBindingsGenerator()
-    result = generator.generate([(temp_header_file, "test")], output=str(output_dir))
+    result = generator.generate([(str(header_file), "test")], output=str(output_dir))
     
     assert isinstance(result, dict)
     assert "test.cs" in result
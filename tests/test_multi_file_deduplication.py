@@ -2,50 +2,66 @@
 Test multi-file deduplication behavior to prevent regression of function filtering bug.
 """
 
-import tempfile
-from pathlib import Path
+import re
+
 import pytest
 
 from cs_binding_generator.generator import CSharpBindingsGenerator
 from cs_binding_generator.config import parse_config_file, BindingConfig
 
 
+# LibraryImport function declarations; the group is the function name
+_FUNC_DECL_RE = re.compile(r'public static partial \w+\s+(\w+)\s*\(')
+_DUPLICATE_FUNC_DECL_RE = re.compile(r'public static.*duplicate_function\s*\(')
+
+
+@pytest.fixture(scope="module")
+def shared_library_headers(tmp_path_factory):
+    """lib1.h and lib2.h, which both include shared.h; written once for the module, so tests must not modify them"""
+    header_dir = tmp_path_factory.mktemp("shared_library_headers")
+
+    # A shared header with common functions and types
+    shared_header = header_dir / "shared.h"
+    shared_header.write_text("""
+        int shared_function();
+        int shared_function_1();
+        int shared_function_2();
+        typedef struct SharedStruct {
+            int value;
+        } SharedStruct;
+        typedef union SharedUnion {
+            int i;
+            float f;
+        } SharedUnion;
+    """)
+
+    # Two library headers that both include shared.h
+    lib1_header = header_dir / "lib1.h"
+    lib1_header.write_text(f"""
+        #include "{shared_header}"
+        int lib1_specific_function();
+    """)
+    lib2_header = header_dir / "lib2.h"
+    lib2_header.write_text(f"""
+        #include "{shared_header}"
+        int lib2_specific_function();
+    """)
+
+    return {"dir": str(header_dir), "lib1": str(lib1_header), "lib2": str(lib2_header)}
+
+
 class TestMultiFileDeduplication:
     """Test that multi-file generation properly handles function deduplication"""
 
-    def test_shared_functions_included_in_both_libraries(self, temp_dir):
+    def test_shared_functions_included_in_both_libraries(self, shared_library_headers, translation_unit_cache):
         """Test that functions shared between headers are included in both libraries"""
-        # Create a shared header with common functions
-        shared_header = temp_dir / "shared.h"
-        shared_header.write_text("""
-            int shared_function_1();
-            int shared_function_2();
-            typedef struct SharedStruct {
-                int value;
-            } SharedStruct;
-        """)
-        
-        # Create lib1 header that includes shared.h
-        lib1_header = temp_dir / "lib1.h"
-        lib1_header.write_text(f"""
-            #include "{shared_header}"
-            int lib1_specific_function();
-        """)
-        
-        # Create lib2 header that also includes shared.h
-        lib2_header = temp_dir / "lib2.h"
-        lib2_header.write_text(f"""
-            #include "{shared_header}"
-            int lib2_specific_function();
-        """)
-
-        generator = CSharpBindingsGenerator()
+        generator = CSharpBindingsGenerator(translation_units=translation_unit_cache)
         
         # Generate multi-file bindings processing both libraries
         result = generator.generate([
-            (str(lib1_header), "lib1"),
-            (str(lib2_header), "lib2")
-        ], output=str(temp_dir), include_dirs=[str(temp_dir)])
+            (shared_library_headers["lib1"], "lib1"),
+            (shared_library_headers["lib2"], "lib2")
+        ], output=None, include_dirs=[shared_library_headers["dir"]])
         
         assert isinstance(result, dict)
         assert "lib1.cs" in result
@@ -174,53 +190,22 @@ class TestMultiFileDeduplication:
         
         # Should appear only once in the generated bindings (plus in comments/metadata)
         # Look for the actual function declaration
-        import re
-        function_declarations = re.findall(r'public static.*duplicate_function\s*\(', result_content)
+        function_declarations = _DUPLICATE_FUNC_DECL_RE.findall(result_content)
         assert len(function_declarations) == 1, f"Expected 1 duplicate_function declaration, found {len(function_declarations)}"
 
     def _extract_function_names(self, content: str) -> set:
         """Extract function names from generated C# content"""
-        import re
-        # Look for LibraryImport function declarations
-        pattern = r'public static partial \w+\s+(\w+)\s*\('
-        matches = re.findall(pattern, content)
-        return set(matches)
+        return set(_FUNC_DECL_RE.findall(content))
 
-    def test_global_deduplication_prevents_duplicate_partial_methods(self, temp_dir):
+    def test_global_deduplication_prevents_duplicate_partial_methods(self, shared_library_headers, translation_unit_cache):
         """Test that global deduplication prevents duplicate partial method definitions"""
-        # Create a shared header with functions that would cause conflicts
-        shared_header = temp_dir / "shared.h"
-        shared_header.write_text("""
-            int shared_function();
-            typedef struct SharedStruct {
-                int value;
-            } SharedStruct;
-            typedef union SharedUnion {
-                int i;
-                float f;
-            } SharedUnion;
-        """)
-        
-        # Create two library headers that both include the shared header
-        lib1_header = temp_dir / "lib1.h"
-        lib1_header.write_text(f"""
-            #include "{shared_header}"
-            int lib1_function();
-        """)
-        
-        lib2_header = temp_dir / "lib2.h"
-        lib2_header.write_text(f"""
-            #include "{shared_header}"
-            int lib2_function();
-        """)
-        
-        generator = CSharpBindingsGenerator()
+        generator = CSharpBindingsGenerator(translation_units=translation_unit_cache)
         
         # Test multi-file generation
         result = generator.generate([
-            (str(lib1_header), "lib1"),
-            (str(lib2_header), "lib2")
-        ], output=str(temp_dir), include_dirs=[str(temp_dir)])
+            (shared_library_headers["lib1"], "lib1"),
+            (shared_library_headers["lib2"], "lib2")
+        ], output=None, include_dirs=[shared_library_headers["dir"]])
         
         lib1_content = result["lib1.cs"]
         lib2_content = result["lib2.cs"]
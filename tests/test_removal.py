@@ -2,28 +2,24 @@
 Test the removal functionality for filtering types/functions.
 """
 
-import tempfile
-from pathlib import Path
 import pytest
 
-from cs_binding_generator.generator import CSharpBindingsGenerator
-from cs_binding_generator.config import parse_config_file, BindingConfig
+from cs_binding_generator.config import parse_config_string, BindingConfig
 
 
 class TestRemovalFunctionality:
     """Test removal feature that filters out types/functions"""
 
-    def test_simple_function_removal(self, temp_dir):
-        """Test removing a specific function by exact name"""
+    def test_simple_function_removal(self, temp_dir, generator):
+        """Test removing a specific function by exact name, with the rule read from XML configuration"""
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             void keep_function();
             void remove_function();
             void another_keep();
-        """)
+        """
         
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
+        config = parse_config_string(f"""
             <bindings>
                 <remove pattern="remove_function"/>
                 <library name="testlib" namespace="Test">
@@ -32,71 +28,63 @@ class TestRemovalFunctionality:
             </bindings>
         """)
         
-        config = parse_config_file(str(config))
-        
-        generator = CSharpBindingsGenerator()
         for pattern, is_regex in config.removals:
             generator.type_mapper.add_removal(pattern, is_regex)
             
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
         
-        # Verify removed function is not present
+        # Removed function is not present
         assert "remove_function" not in result["testlib.cs"]
-        # Verify kept functions are present
+        # Kept functions are present
         assert "keep_function" in result["testlib.cs"]
         assert "another_keep" in result["testlib.cs"]
 
-    def test_regex_function_removal(self, temp_dir):
+    def test_regex_function_removal(self, temp_dir, generator):
         """Test removing functions using regex pattern"""
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             void SDL_Init();
             void SDL_Quit();
             void SDL_CreateWindow();
             void my_function();
             void another_function();
-        """)
-        
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="SDL_.*" regex="true"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
         
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            removals=[("SDL_.*", True)],
+            library_namespaces={"testlib": "Test"},
+        )
         
-        generator = CSharpBindingsGenerator()
         for pattern, is_regex in config.removals:
             generator.type_mapper.add_removal(pattern, is_regex)
             
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
         
-        # Verify SDL_ functions are removed
+        # SDL_ functions are removed
         assert "SDL_Init" not in result["testlib.cs"]
         assert "SDL_Quit" not in result["testlib.cs"]
         assert "SDL_CreateWindow" not in result["testlib.cs"]
-        # Verify other functions remain
+        # Other functions remain
         assert "my_function" in result["testlib.cs"]
         assert "another_function" in result["testlib.cs"]
 
-    def test_struct_removal(self, temp_dir):
+    def test_struct_removal(self, temp_dir, generator):
         """Test removing struct definitions"""
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             typedef struct KeepStruct {
                 int x;
             } KeepStruct;
@@ -108,41 +96,35 @@ class TestRemovalFunctionality:
             typedef struct AnotherKeep {
                 int z;
             } AnotherKeep;
-        """)
-        
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="RemoveStruct"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
         
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            removals=[("RemoveStruct", False)],
+            library_namespaces={"testlib": "Test"},
+        )
         
-        generator = CSharpBindingsGenerator()
         for pattern, is_regex in config.removals:
             generator.type_mapper.add_removal(pattern, is_regex)
             
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
         
-        # Verify removed struct is not present
+        # Removed struct is not present
         assert "struct RemoveStruct" not in result["testlib.cs"]
-        # Verify kept structs are present
+        # Kept structs are present
         assert "struct KeepStruct" in result["testlib.cs"]
         assert "struct AnotherKeep" in result["testlib.cs"]
 
-    def test_enum_removal(self, temp_dir):
+    def test_enum_removal(self, temp_dir, generator):
         """Test removing enum definitions"""
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             typedef enum KeepEnum {
                 KEEP_A,
                 KEEP_B
@@ -152,42 +134,36 @@ class TestRemovalFunctionality:
                 REMOVE_A,
                 REMOVE_B
             } RemoveEnum;
-        """)
-        
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="RemoveEnum"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
         
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            removals=[("RemoveEnum", False)],
+            library_namespaces={"testlib": "Test"},
+        )
         
-        generator = CSharpBindingsGenerator()
         for pattern, is_regex in config.removals:
             generator.type_mapper.add_removal(pattern, is_regex)
             
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
         
-        # Verify removed enum is not present
+        # Removed enum is not present
         assert "enum RemoveEnum" not in result["testlib.cs"]
         assert "REMOVE_A" not in result["testlib.cs"]
-        # Verify kept enum is present
+        # Kept enum is present
         assert "enum KeepEnum" in result["testlib.cs"]
         assert "KEEP_A" in result["testlib.cs"]
 
-    def test_union_removal(self, temp_dir):
+    def test_union_removal(self, temp_dir, generator):
         """Test removing union definitions"""
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             typedef union KeepUnion {
                 int i;
                 float f;
@@ -197,104 +173,82 @@ class TestRemovalFunctionality:
                 int x;
                 double d;
             } RemoveUnion;
-        """)
-        
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="RemoveUnion"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
         
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            removals=[("RemoveUnion", False)],
+            library_namespaces={"testlib": "Test"},
+        )
         
-        generator = CSharpBindingsGenerator()
         for pattern, is_regex in config.removals:
             generator.type_mapper.add_removal(pattern, is_regex)
             
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
         
-        # Verify removed union is not present
+        # Removed union is not present
         assert "RemoveUnion" not in result["testlib.cs"]
-        # Verify kept union is present
+        # Kept union is present
         assert "KeepUnion" in result["testlib.cs"]
 
-    def test_multiple_removal_rules(self, temp_dir):
+    def test_multiple_removal_rules(self, temp_dir, generator):
         """Test multiple removal rules with precedence"""
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             void SDL_Init();
             void SDL_Quit();
             void TCOD_Init();
             void TCOD_Quit();
             void my_function();
-        """)
-        
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="SDL_.*" regex="true"/>
-                <remove pattern="TCOD_Quit"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
         
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            removals=[("SDL_.*", True), ("TCOD_Quit", False)],
+            library_namespaces={"testlib": "Test"},
+        )
         
-        generator = CSharpBindingsGenerator()
         for pattern, is_regex in config.removals:
             generator.type_mapper.add_removal(pattern, is_regex)
             
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
         
-        # Verify SDL_ functions are removed
+        # SDL_ functions and the specific TCOD_Quit are removed
         assert "SDL_Init" not in result["testlib.cs"]
         assert "SDL_Quit" not in result["testlib.cs"]
-        # Verify specific TCOD_Quit is removed
         assert "TCOD_Quit" not in result["testlib.cs"]
-        # Verify TCOD_Init remains (only Quit was specifically removed)
+        # TCOD_Init (only Quit was specifically removed) and my_function remain
         assert "TCOD_Init" in result["testlib.cs"]
-        # Verify my_function remains
         assert "my_function" in result["testlib.cs"]
 
-    def test_removal_with_rename_precedence(self, temp_dir):
+    def test_removal_with_rename_precedence(self, temp_dir, generator):
         """Test that removals work alongside renames with proper precedence"""
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             void SDL_CreateWindow();
             void SDL_DestroyWindow();
             void SDL_Init();
-        """)
-        
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="SDL_Init"/>
-                <rename from="SDL_(.*)" to="$1" regex="true"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
         
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            renames=[("SDL_(.*)", "$1", True)],
+            removals=[("SDL_Init", False)],
+            library_namespaces={"testlib": "Test"},
+        )
         
-        generator = CSharpBindingsGenerator()
         for from_name, to_name, is_regex in config.renames:
             generator.type_mapper.add_rename(from_name, to_name, is_regex)
         for pattern, is_regex in config.removals:
@@ -302,69 +256,64 @@ class TestRemovalFunctionality:
             
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
         
+        cs = result["testlib.cs"]
         # Verify SDL_Init is removed (removal happens before function generation)
-        assert "SDL_Init" not in result["testlib.cs"]
+        assert "SDL_Init" not in cs
         assert "Init" not in result or "InitWindow" in result  # Make sure it's not just renamed
         # Verify other functions are renamed
-        assert "CreateWindow" in result["testlib.cs"]
-        assert "DestroyWindow" in result["testlib.cs"]
+        assert "CreateWindow" in cs
+        assert "DestroyWindow" in cs
 
-    def test_regex_removal_complex_pattern(self, temp_dir):
+    def test_regex_removal_complex_pattern(self, temp_dir, generator):
         """Test complex regex patterns for removal"""
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             void internal_helper_function();
             void _private_function();
             void __system_function();
             void public_function();
             void user_function();
-        """)
-
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="(_|__).*" regex="true"/>
-                <remove pattern=".*_helper_.*" regex="true"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
 
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            removals=[("(_|__).*", True), (".*_helper_.*", True)],
+            library_namespaces={"testlib": "Test"},
+        )
 
-        generator = CSharpBindingsGenerator()
         for pattern, is_regex in config.removals:
             generator.type_mapper.add_removal(pattern, is_regex)
 
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
 
-        # Verify removed functions
+        # Removed functions
         assert "internal_helper_function" not in result["testlib.cs"]
         assert "_private_function" not in result["testlib.cs"]
         assert "__system_function" not in result["testlib.cs"]
-        # Verify kept functions
+        # Kept functions
         assert "public_function" in result["testlib.cs"]
         assert "user_function" in result["testlib.cs"]
 
-    def test_opaque_typedef_removal(self, temp_dir):
+    def test_opaque_typedef_removal(self, temp_dir, generator):
         """Test that opaque typedefs (forward declarations) are removed when matching removal pattern.
 
         This tests the bug fix where opaque typedefs like 'typedef struct SDL_Window SDL_Window;'
         were generating empty partial structs even when SDL_Window was marked for removal.
         """
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             // Opaque typedef - no struct definition, just forward declaration
             typedef struct SDL_Window SDL_Window;
             typedef struct SDL_Renderer SDL_Renderer;
@@ -372,67 +321,52 @@ class TestRemovalFunctionality:
 
             // Functions that use the types - these have their own names
             KeepHandle* create_handle();
-        """)
-
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="SDL_.*" regex="true"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
 
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            removals=[("SDL_.*", True)],
+            library_namespaces={"testlib": "Test"},
+        )
 
-        generator = CSharpBindingsGenerator()
         for pattern, is_regex in config.removals:
             generator.type_mapper.add_removal(pattern, is_regex)
 
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
 
-        # Verify SDL opaque types are NOT generated as empty partial structs
+        # SDL opaque types are NOT generated as empty partial structs
         assert "partial struct SDL_Window" not in result["testlib.cs"]
         assert "partial struct SDL_Renderer" not in result["testlib.cs"]
-        # Verify kept opaque type IS generated
+        # Kept opaque type IS generated and kept function remains
         assert "partial struct KeepHandle" in result["testlib.cs"]
-        # Verify kept function remains
         assert "create_handle" in result["testlib.cs"]
 
-    def test_opaque_typedef_removal_with_rename(self, temp_dir):
+    def test_opaque_typedef_removal_with_rename(self, temp_dir, generator):
         """Test that opaque typedefs are removed even when rename rules exist.
 
         This tests the scenario where types are both renamed and removed,
         ensuring the renamed version doesn't leak through as an empty struct.
         """
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             typedef struct SDL_Window SDL_Window;
             typedef struct SDL_Surface SDL_Surface;
             typedef struct MyHandle MyHandle;
-        """)
-
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="SDL_.*" regex="true"/>
-                <rename from="SDL_Window" to="WindowHandle"/>
-                <rename from="SDL_Surface" to="SurfaceHandle"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
 
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            renames=[("SDL_Window", "WindowHandle", False), ("SDL_Surface", "SurfaceHandle", False)],
+            removals=[("SDL_.*", True)],
+            library_namespaces={"testlib": "Test"},
+        )
 
-        generator = CSharpBindingsGenerator()
         for from_name, to_name, is_regex in config.renames:
             generator.type_mapper.add_rename(from_name, to_name, is_regex)
         for pattern, is_regex in config.removals:
@@ -440,135 +374,116 @@ class TestRemovalFunctionality:
 
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
 
-        # Verify original SDL types are not generated
+        # Neither the original SDL types nor their renamed versions are generated (removal takes precedence)
         assert "partial struct SDL_Window" not in result["testlib.cs"]
         assert "partial struct SDL_Surface" not in result["testlib.cs"]
-        # Verify renamed versions are also not generated (removal should take precedence)
         assert "partial struct WindowHandle" not in result["testlib.cs"]
         assert "partial struct SurfaceHandle" not in result["testlib.cs"]
-        # Verify kept type is generated
+        # Kept type is generated
         assert "partial struct MyHandle" in result["testlib.cs"]
 
-    def test_forward_declaration_struct_removal(self, temp_dir):
+    def test_forward_declaration_struct_removal(self, temp_dir, generator):
         """Test removal of forward-declared structs (STRUCT_DECL without definition)."""
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             // Forward declaration style
             struct SDL_Context;
             typedef struct SDL_Context SDL_Context;
 
             struct KeepContext;
             typedef struct KeepContext KeepContext;
-        """)
-
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="SDL_.*" regex="true"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
 
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            removals=[("SDL_.*", True)],
+            library_namespaces={"testlib": "Test"},
+        )
 
-        generator = CSharpBindingsGenerator()
         for pattern, is_regex in config.removals:
             generator.type_mapper.add_removal(pattern, is_regex)
 
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
 
-        # Verify SDL context struct is not generated as a partial struct
+        # SDL context struct is not generated as a partial struct
         assert "partial struct SDL_Context" not in result["testlib.cs"]
-        # Verify kept context is generated
+        # Kept context is generated
         assert "partial struct KeepContext" in result["testlib.cs"]
 
-    def test_underlying_struct_name_removal(self, temp_dir):
+    def test_underlying_struct_name_removal(self, temp_dir, generator):
         """Test removal when typedef has different name from underlying struct.
 
         Tests the case: typedef struct _InternalName PublicName;
         Both names should be checked against removal patterns.
         """
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             // Underlying struct name differs from typedef name
             typedef struct _SDL_InternalWindow SDL_Window;
             typedef struct _KeepInternal KeepHandle;
-        """)
-
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="SDL_.*" regex="true"/>
-                <remove pattern="_SDL_.*" regex="true"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
 
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            removals=[("SDL_.*", True), ("_SDL_.*", True)],
+            library_namespaces={"testlib": "Test"},
+        )
 
-        generator = CSharpBindingsGenerator()
         for pattern, is_regex in config.removals:
             generator.type_mapper.add_removal(pattern, is_regex)
 
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
 
-        # Verify both the typedef name and underlying name are not generated
+        # Both the typedef name and underlying name are not generated
         assert "SDL_Window" not in result["testlib.cs"]
         assert "_SDL_InternalWindow" not in result["testlib.cs"]
-        # Verify kept types are generated
+        # Kept types are generated
         assert "partial struct KeepHandle" in result["testlib.cs"]
         assert "partial struct _KeepInternal" in result["testlib.cs"]
 
-    def test_opaque_type_not_registered_when_removed(self, temp_dir):
+    def test_opaque_type_not_registered_when_removed(self, temp_dir, generator):
         """Test that removed opaque types are not registered in the type mapper.
 
         This ensures that removed types don't affect pointer type resolution
         for other types that reference them.
         """
         header = temp_dir / "test.h"
-        header.write_text("""
+        header_source = """
             typedef struct SDL_Window SDL_Window;
             typedef struct KeepType KeepType;
-        """)
-
-        config = temp_dir / "config.xml"
-        config.write_text(f"""
-            <bindings>
-                <remove pattern="SDL_.*" regex="true"/>
-                <library name="testlib" namespace="Test">
-                    <include file="{header}"/>
-                </library>
-            </bindings>
-        """)
+        """
 
-        config = parse_config_file(str(config))
+        config = BindingConfig(
+            header_library_pairs=[(str(header), "testlib")],
+            removals=[("SDL_.*", True)],
+            library_namespaces={"testlib": "Test"},
+        )
 
-        generator = CSharpBindingsGenerator()
         for pattern, is_regex in config.removals:
             generator.type_mapper.add_removal(pattern, is_regex)
 
         result = generator.generate(
             config.header_library_pairs,
-            output=str(temp_dir),
+            output=None,
+            unsaved_files={str(header): header_source},
             library_namespaces=config.library_namespaces,
             include_dirs=[str(temp_dir)]
         )
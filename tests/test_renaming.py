@@ -2,8 +2,6 @@
 Test renaming functionality for functions and types.
 """
 
-import tempfile
-from pathlib import Path
 import pytest
 
 from cs_binding_generator.config import parse_config_file, BindingConfig
@@ -3,8 +3,6 @@ Unit tests for TypeMapper
 """
 
 import pytest
-import tempfile
-import os
 from unittest.mock import Mock
 from clang.cindex import TypeKind
 
@@ -183,13 +181,13 @@ class TestTypeMapper:
         result = self.mapper.map_type(mock_type)
         assert result == "int"
     
-    def test_enum_pointer(self):
+    def test_enum_pointer(self, tmp_path):
         """Test that pointers to enums generate correctly using real C code"""
         from cs_binding_generator.generator import CSharpBindingsGenerator
         
         # Create a temporary header with enum pointer
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.h', delete=False) as f:
-            f.write("""
+        header_path = tmp_path / "enum_pointer.h"
+        header_path.write_text("""
                 enum MyEnum {
                     VALUE1 = 0,
                     VALUE2 = 1
@@ -198,26 +196,20 @@ class TestTypeMapper:
                 void test_function(enum MyEnum* ptr);
                 void test_function2(enum MyEnum* out1, enum MyEnum* out2);
             """)
-            header_path = f.name
         
-        try:
-            # Generate bindings (using tmp_path fixture pattern from test_generator.py)
-            generator = CSharpBindingsGenerator()
-            result = generator.generate([(header_path, "test")], output="-")
-            
-            # Result is a dict with filenames as keys, get the test.cs file
-            assert "test.cs" in result
-            output = result["test.cs"]
-            
-            # Verify enum pointer parameters don't have "enum " prefix
-            assert "enum MyEnum*" not in output, "Found 'enum MyEnum*' in output, should be 'MyEnum*'"
-            assert "MyEnum* ptr" in output or "MyEnum* out1" in output, f"Expected 'MyEnum* ptr' or 'MyEnum* out1' in output"
-            
-            # Verify the enum itself is generated correctly
-            assert "public enum MyEnum" in output, "Expected enum definition"
-        finally:
-            # Clean up
-            os.unlink(header_path)
+        generator = CSharpBindingsGenerator()
+        result = generator.generate([(str(header_path), "test")], output=str(tmp_path))
+        
+        # Result is a dict with filenames as keys, get the test.cs file
+        assert "test.cs" in result
+        output = result["test.cs"]
+        
+        # Verify enum pointer parameters don't have "enum " prefix
+        assert "enum MyEnum*" not in output, "Found 'enum MyEnum*' in output, should be 'MyEnum*'"
+        assert "MyEnum* ptr" in output or "MyEnum* out1" in output, f"Expected 'MyEnum* ptr' or 'MyEnum* out1' in output"
+        
+        # Verify the enum itself is generated correctly
+        assert "public enum MyEnum" in output, "Expected enum definition"
     
     def test_struct_type(self):
         """Test that structs map to their spelling"""
@@ -228,6 +220,22 @@ class TestTypeMapper:
         result = self.mapper.map_type(mock_type)
         assert result == "Point"
     
+    def test_record_prefixes_keep_enum_tag(self):
+        """Test that record spellings are stripped of qualifiers and struct tags but not of an 'enum ' tag"""
+        mock_type = Mock()
+        mock_type.kind = TypeKind.RECORD
+        mock_type.spelling = "const volatile struct Point"
+        assert self.mapper.map_type(mock_type) == "Point"
+
+        mock_type.spelling = "const enum Point"
+        assert self.mapper.map_type(mock_type) == "enum Point"
+
+        mock_pointer = Mock()
+        mock_pointer.kind = TypeKind.POINTER
+        mock_pointer.spelling = "const enum Point *"
+        mock_pointer.get_pointee.return_value = mock_type
+        assert self.mapper.map_type(mock_pointer) == "enum Point*"
+
     def test_typedef(self):
         """Test that typedefs preserve typedef name (updated behavior)"""
         mock_type = Mock()
@@ -282,3 +290,67 @@ class TestTypeMapper:
         # floats/doubles should map regardless of size reported (float->float, double->double)
         assert self.mapper.map_type(mk(TypeKind.FLOAT, 4)) == "float"
         assert self.mapper.map_type(mk(TypeKind.DOUBLE, 8)) == "double"
+
+    def test_cached_lookups_follow_new_patterns(self):
+        """Test that rename and removal results looked up earlier are recomputed once patterns change"""
+        assert self.mapper.apply_rename("SDL_Window") == "SDL_Window"
+        assert not self.mapper.should_remove("internal_func")
+
+        self.mapper.add_rename("SDL_(.*)", "$1", is_regex=True)
+        self.mapper.add_removal("internal_.*", is_regex=True)
+        assert self.mapper.apply_rename("SDL_Window") == "Window"
+        assert self.mapper.should_remove("internal_func")
+
+        self.mapper.reset()
+        assert self.mapper.apply_rename("SDL_Window") == "SDL_Window"
+        assert not self.mapper.should_remove("internal_func")
+
+    def test_rename_first_matching_rule_wins(self):
+        """Test that exact and regex renames are applied in the order they were added"""
+        self.mapper.add_rename("SDL_Window", "Window")
+        self.mapper.add_rename("SDL_(.*)", "$1_x", is_regex=True)
+        self.mapper.add_rename("TCOD_(.*)", "$1", is_regex=True)
+        self.mapper.add_rename("TCOD_Console", "Console2")
+        self.mapper.add_rename("SDL_Window", "Window2")
+
+        assert self.mapper.apply_rename("SDL_Window") == "Window"
+        assert self.mapper.apply_rename("SDL_Renderer") == "Renderer_x"
+        assert self.mapper.apply_rename("TCOD_Console") == "Console"
+        assert self.mapper.apply_rename("Other") == "Other"
+
+    def test_removal_exact_and_regex_patterns(self):
+        """Test that exact removals match whole names only and regex removals use fullmatch"""
+        self.mapper.add_removal("SDL_Init")
+        self.mapper.add_removal("internal_.*", is_regex=True)
+        self.mapper.add_removal("SDL_Quit")
+
+        assert self.mapper.should_remove("SDL_Init")
+        assert self.mapper.should_remove("SDL_Quit")
+        assert self.mapper.should_remove("internal_helper")
+        assert not self.mapper.should_remove("SDL_InitSubSystem")
+        assert not self.mapper.should_remove("my_internal_helper")
+
+    def test_regex_removal_with_backreference(self):
+        """Test that regex removals with groups keep their own backreference numbering"""
+        self.mapper.add_removal("legacy_.*", is_regex=True)
+        self.mapper.add_removal(r"(\w+)_\1", is_regex=True)
+
+        assert self.mapper.should_remove("legacy_init")
+        assert self.mapper.should_remove("dup_dup")
+        assert not self.mapper.should_remove("dup_other")
+
+    def test_reset_clears_registrations(self):
+        """Test that reset drops renames, removals, flag patterns and learned types"""
+        self.mapper.add_rename("SDL_Window", "Window")
+        self.mapper.add_removal("internal_.*", is_regex=True)
+        self.mapper.add_flag_enum("(.*)Flags", is_regex=True)
+        self.mapper.opaque_types.add("SDL_Window")
+
+        self.mapper.reset()
+
+        assert self.mapper.apply_rename("SDL_Window") == "SDL_Window"
+        assert not self.mapper.should_remove("internal_func")
+        assert not self.mapper.is_flag_enum("WindowFlags")
+        assert not self.mapper.opaque_types
+        # Built-in mappings are kept
+        assert self.mapper.typedef_map["size_t"] == "nuint"
@@ -2,8 +2,6 @@
 Tests for variadic function generation
 """
 
-import tempfile
-from pathlib import Path
 from unittest.mock import Mock
 
 import clang.cindex
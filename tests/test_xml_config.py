@@ -3,17 +3,15 @@ Tests for XML configuration file parsing
 """
 
 import pytest
-import tempfile
 from pathlib import Path
-import xml.etree.ElementTree as ET
 
-from cs_binding_generator.config import parse_config_file, BindingConfig
+from cs_binding_generator.config import parse_config_file, parse_config_string, BindingConfig
 
 
 class TestXMLConfigParsing:
     """Test XML configuration file parsing functionality"""
     
-    def test_parse_valid_config_file(self, temp_dir):
+    def test_parse_valid_config_file(self):
         """Test parsing a valid XML configuration file"""
         config_content = """
         <bindings>
@@ -23,10 +21,7 @@ class TestXMLConfigParsing:
         </bindings>
         """
 
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
 
         assert len(config.header_library_pairs) == 1
         assert config.header_library_pairs[0] == ("/path/to/test.h", "testlib")
@@ -34,7 +29,7 @@ class TestXMLConfigParsing:
         assert config.include_dirs == []
         assert config.visibility == "public"  # Default visibility
     
-    def test_parse_multiple_libraries(self, temp_dir):
+    def test_parse_multiple_libraries(self):
         """Test parsing config with multiple libraries"""
         config_content = """
         <bindings>
@@ -48,10 +43,7 @@ class TestXMLConfigParsing:
         </bindings>
         """
         
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-        
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
         
         assert len(config.header_library_pairs) == 3
         assert config.header_library_pairs[0] == ("/path/to/lib1.h", "lib1")
@@ -61,7 +53,7 @@ class TestXMLConfigParsing:
         assert config.library_namespaces == {"lib1": "Lib1Namespace", "lib2": "Lib2Namespace"}
         assert config.include_dirs == []
     
-    def test_parse_config_without_namespace(self, temp_dir):
+    def test_parse_config_without_namespace(self):
         """Test parsing config without namespace specification"""
         config_content = """
         <bindings>
@@ -71,17 +63,14 @@ class TestXMLConfigParsing:
         </bindings>
         """
         
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-        
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
         
         assert len(config.header_library_pairs) == 1
         assert config.header_library_pairs[0] == ("/path/to/test.h", "testlib")
         assert config.library_namespaces == {}
         assert config.include_dirs == []
     
-    def test_parse_config_with_class_attributes(self, temp_dir):
+    def test_parse_config_with_class_attributes(self):
         """Test parsing config with custom class names"""
         config_content = """
         <bindings>
@@ -97,10 +86,7 @@ class TestXMLConfigParsing:
         </bindings>
         """
         
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-        
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
         
         assert len(config.header_library_pairs) == 3
         assert config.header_library_pairs[0] == ("/path/to/lib1.h", "lib1")
@@ -110,75 +96,96 @@ class TestXMLConfigParsing:
         assert config.include_dirs == []
         assert config.library_class_names == {"lib1": "CustomLib1", "lib2": "CustomLib2", "lib3": "NativeMethods"}
     
-    def test_parse_config_missing_library_name(self, temp_dir):
-        """Test parsing config with missing library name attribute"""
-        config_content = """
-        <bindings>
-            <library>
-                <include file="/path/to/test.h"/>
-            </library>
-        </bindings>
-        """
-        
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-        
-        with pytest.raises(ValueError, match="Library element missing 'name' attribute"):
+    @pytest.mark.parametrize("config_content, message", [
+        pytest.param(
+            '<bindings><library><include file="/path/to/test.h"/></library></bindings>',
+            "Library element missing 'name' attribute",
+            id="library_missing_name",
+        ),
+        pytest.param(
+            '<bindings><library name="testlib"><include/></library></bindings>',
+            "Include element.*missing 'file' attribute",
+            id="include_missing_file",
+        ),
+        pytest.param(
+            '<wrongroot><library name="testlib"><include file="/path/to/test.h"/></library></wrongroot>',
+            "Expected root element 'bindings'",
+            id="wrong_root_element",
+        ),
+        pytest.param(
+            '<bindings><library name="testlib"><include file="/path/to/test.h"</bindings>',
+            "XML parsing error",
+            id="invalid_xml",
+        ),
+        pytest.param(
+            '<bindings><include_directory/></bindings>',
+            "Include directory element missing 'path' attribute",
+            id="include_directory_missing_path",
+        ),
+        pytest.param(
+            '<bindings><constants pattern="TEST_.*" type="uint"/></bindings>',
+            "Constants element.*missing 'name' attribute",
+            id="constants_missing_name",
+        ),
+        pytest.param(
+            '<bindings><constants name="TestFlags" type="uint"/></bindings>',
+            "Constants element.*missing 'pattern' attribute",
+            id="constants_missing_pattern",
+        ),
+    ])
+    def test_parse_config_rejects_invalid_config(self, config_content, message):
+        """Test that invalid configurations raise ValueError with a message naming the problem"""
+        with pytest.raises(ValueError, match=message):
+            parse_config_string(config_content)
+
+    def test_parse_config_file_invalid_xml(self, tmp_path):
+        """Test that XML errors in a configuration file are reported as ValueError"""
+        config_file = tmp_path / "config.xml"
+        config_file.write_text("<bindings><library name='testlib'>")
+
+        with pytest.raises(ValueError, match="XML parsing error"):
             parse_config_file(str(config_file))
     
-    def test_parse_config_missing_include_file(self, temp_dir):
-        """Test parsing config with missing include file attribute"""
+    def test_parse_config_string_matches_file(self, tmp_path):
+        """Test that configuration text parses the same as the same text read from a file"""
         config_content = """
-        <bindings>
-            <library name="testlib">
-                <include/>
+        <bindings visibility="internal">
+            <include_directory path="/usr/include"/>
+            <remove pattern="SDL_.*" regex="true"/>
+            <library name="testlib" namespace="TestNamespace">
+                <include file="/path/to/test.h"/>
             </library>
         </bindings>
         """
-        
-        config_file = temp_dir / "config.xml"
+
+        config_file = tmp_path / "config.xml"
         config_file.write_text(config_content)
-        
-        with pytest.raises(ValueError, match="Include element.*missing 'file' attribute"):
-            parse_config_file(str(config_file))
-    
-    def test_parse_config_wrong_root_element(self, temp_dir):
-        """Test parsing config with wrong root element"""
-        config_content = """
-        <wrongroot>
+
+        assert parse_config_string(config_content) == parse_config_file(str(config_file))
+
+    def test_parse_config_with_removals_and_renames(self):
+        """Test parsing exact and regex remove and rename rules in document order"""
+        config = parse_config_string("""
+        <bindings>
+            <remove pattern="SDL_.*" regex="true"/>
+            <remove pattern="TCOD_Quit"/>
+            <rename from="SDL_(.*)" to="$1" regex="true"/>
+            <rename from="TCOD_Console" to="Console"/>
             <library name="testlib">
                 <include file="/path/to/test.h"/>
             </library>
-        </wrongroot>
-        """
-        
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-        
-        with pytest.raises(ValueError, match="Expected root element 'bindings'"):
-            parse_config_file(str(config_file))
-    
-    def test_parse_config_invalid_xml(self, temp_dir):
-        """Test parsing invalid XML"""
-        config_content = """
-        <bindings>
-            <library name="testlib">
-                <include file="/path/to/test.h"
         </bindings>
-        """
-        
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-        
-        with pytest.raises(ValueError, match="XML parsing error"):
-            parse_config_file(str(config_file))
-    
+        """)
+
+        assert config.removals == [("SDL_.*", True), ("TCOD_Quit", False)]
+        assert config.renames == [("SDL_(.*)", "$1", True), ("TCOD_Console", "Console", False)]
+
     def test_parse_config_file_not_found(self):
         """Test parsing non-existent config file"""
         with pytest.raises(FileNotFoundError, match="Configuration file not found"):
             parse_config_file("/nonexistent/config.xml")
     
-    def test_parse_real_config_file(self, temp_dir):
+    def test_parse_real_config_file(self):
         """Test parsing the actual LibTCOD config file format"""
         config_content = """
         <bindings>
@@ -191,10 +198,7 @@ class TestXMLConfigParsing:
         </bindings>
         """
         
-        config_file = temp_dir / "cs-bindings.xml"
-        config_file.write_text(config_content)
-        
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
         
         assert len(config.header_library_pairs) == 2
         assert config.header_library_pairs[0] == ("/usr/include/libtcod/libtcod.h", "libtcod")
@@ -202,7 +206,7 @@ class TestXMLConfigParsing:
         assert config.library_namespaces == {"libtcod": "Libtcod", "SDL3": "SDL3"}
         assert config.include_dirs == []
     
-    def test_config_with_whitespace_handling(self, temp_dir):
+    def test_config_with_whitespace_handling(self):
         """Test that whitespace in config values is properly handled"""
         config_content = """
         <bindings>
@@ -212,17 +216,14 @@ class TestXMLConfigParsing:
         </bindings>
         """
         
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-        
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
         
         assert len(config.header_library_pairs) == 1
         assert config.header_library_pairs[0] == ("/path/to/test.h", "testlib")  # Should be stripped
         assert config.library_namespaces == {"testlib": "TestNamespace"}  # Namespace stripped in new impl
         assert config.include_dirs == []
     
-    def test_config_with_global_include_directories(self, temp_dir):
+    def test_config_with_global_include_directories(self):
         """Test parsing config with global include directories"""
         config_content = """
         <bindings>
@@ -234,17 +235,14 @@ class TestXMLConfigParsing:
         </bindings>
         """
         
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-        
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
         
         assert len(config.header_library_pairs) == 1
         assert config.header_library_pairs[0] == ("/path/to/test.h", "testlib")
         assert config.library_namespaces == {"testlib": "TestNamespace"}
         assert config.include_dirs == ["/usr/include", "/usr/local/include"]
     
-    def test_config_with_library_specific_include_directories(self, temp_dir):
+    def test_config_with_library_specific_include_directories(self):
         """Test parsing config with library-specific include directories"""
         config_content = """
         <bindings>
@@ -260,10 +258,7 @@ class TestXMLConfigParsing:
         </bindings>
         """
         
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-        
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
         
         assert len(config.header_library_pairs) == 2
         assert config.header_library_pairs[0] == ("/path/to/lib1.h", "lib1")
@@ -271,29 +266,12 @@ class TestXMLConfigParsing:
         assert config.library_namespaces == {"lib1": "Lib1Namespace"}
         assert set(config.include_dirs) == {"/usr/include", "/usr/include/lib1", "/usr/include/lib2"}
     
-    def test_config_missing_include_directory_path(self, temp_dir):
-        """Test parsing config with missing include directory path attribute"""
-        config_content = """
-        <bindings>
-            <include_directory/>
-            <library name="testlib">
-                <include file="/path/to/test.h"/>
-            </library>
-        </bindings>
-        """
-        
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-        
-        with pytest.raises(ValueError, match="Include directory element missing 'path' attribute"):
-            parse_config_file(str(config_file))
-    
-    def test_fatal_parse_errors_cause_immediate_failure(self, temp_dir):
+    def test_fatal_parse_errors_cause_immediate_failure(self, tmp_path):
         """Test that fatal parsing errors cause immediate failure with clear error messages"""
         from cs_binding_generator.generator import CSharpBindingsGenerator
         
         # Create a header that includes a non-existent file
-        header_file = temp_dir / "test.h"
+        header_file = tmp_path / "test.h"
         header_file.write_text('#include "nonexistent.h"\\nint test_func();')
         
         generator = CSharpBindingsGenerator()
@@ -302,8 +280,8 @@ class TestXMLConfigParsing:
         with pytest.raises(RuntimeError) as exc_info:
             generator.generate(
                 [(str(header_file), "testlib")],
-                output=str(temp_dir),
-                include_dirs=[str(temp_dir)]  # Include dir provided but file still missing
+                output=str(tmp_path),
+                include_dirs=[str(tmp_path)]  # Include dir provided but file still missing
             )
         
         error_msg = str(exc_info.value)
@@ -311,7 +289,7 @@ class TestXMLConfigParsing:
         assert "nonexistent.h" in error_msg
         assert "Check include directories" in error_msg
     
-    def test_parse_config_with_using_statements(self, temp_dir):
+    def test_parse_config_with_using_statements(self):
         """Test parsing config with using statements in libraries"""
         config_content = """
         <bindings>
@@ -327,10 +305,7 @@ class TestXMLConfigParsing:
         </bindings>
         """
         
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-        
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
         
         assert len(config.header_library_pairs) == 2
         assert config.header_library_pairs[0] == ("/path/to/lib1.h", "lib1")
@@ -342,7 +317,7 @@ class TestXMLConfigParsing:
             "lib2": ["System.IO"]
         }
     
-    def test_parse_config_with_internal_visibility(self, temp_dir):
+    def test_parse_config_with_internal_visibility(self):
         """Test parsing config with internal visibility"""
         config_content = """
         <bindings visibility="internal">
@@ -352,16 +327,13 @@ class TestXMLConfigParsing:
         </bindings>
         """
 
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
 
         assert len(config.header_library_pairs) == 1
         assert config.header_library_pairs[0] == ("/path/to/test.h", "testlib")
         assert config.visibility == "internal"
 
-    def test_parse_config_with_public_visibility(self, temp_dir):
+    def test_parse_config_with_public_visibility(self):
         """Test parsing config with explicit public visibility"""
         config_content = """
         <bindings visibility="public">
@@ -371,16 +343,13 @@ class TestXMLConfigParsing:
         </bindings>
         """
 
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
 
         assert len(config.header_library_pairs) == 1
         assert config.header_library_pairs[0] == ("/path/to/test.h", "testlib")
         assert config.visibility == "public"
 
-    def test_parse_config_with_invalid_visibility(self, temp_dir):
+    def test_parse_config_with_invalid_visibility(self):
         """Test parsing config with invalid visibility value"""
         config_content = """
         <bindings visibility="protected">
@@ -390,16 +359,13 @@ class TestXMLConfigParsing:
         </bindings>
         """
 
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-
         # Should exit with code 1
         with pytest.raises(SystemExit) as exc_info:
-            parse_config_file(str(config_file))
+            parse_config_string(config_content)
 
         assert exc_info.value.code == 1
 
-    def test_parse_config_default_visibility(self, temp_dir):
+    def test_parse_config_default_visibility(self):
         """Test parsing config without visibility defaults to public"""
         config_content = """
         <bindings>
@@ -409,14 +375,11 @@ class TestXMLConfigParsing:
         </bindings>
         """
 
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
 
         assert config.visibility == "public"
 
-    def test_parse_config_with_constants(self, temp_dir):
+    def test_parse_config_with_constants(self):
         """Test parsing config with constants definitions"""
         config_content = """
         <bindings>
@@ -428,10 +391,7 @@ class TestXMLConfigParsing:
         </bindings>
         """
 
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
 
         assert len(config.header_library_pairs) == 1
         assert config.header_library_pairs[0] == ("/path/to/test.h", "testlib")
@@ -439,41 +399,7 @@ class TestXMLConfigParsing:
         assert config.global_constants[0] == ("WindowFlags", "TEST_WINDOW_.*", "ulong", False)
         assert config.global_constants[1] == ("InitFlags", "TEST_INIT_.*", "uint", False)
 
-    def test_parse_config_constants_missing_name(self, temp_dir):
-        """Test that constants without name attribute raises error"""
-        config_content = """
-        <bindings>
-            <constants pattern="TEST_.*" type="uint"/>
-            <library name="testlib">
-                <include file="/path/to/test.h"/>
-            </library>
-        </bindings>
-        """
-
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-
-        with pytest.raises(ValueError, match="Constants element.*missing 'name' attribute"):
-            parse_config_file(str(config_file))
-
-    def test_parse_config_constants_missing_pattern(self, temp_dir):
-        """Test that constants without pattern attribute raises error"""
-        config_content = """
-        <bindings>
-            <constants name="TestFlags" type="uint"/>
-            <library name="testlib">
-                <include file="/path/to/test.h"/>
-            </library>
-        </bindings>
-        """
-
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-
-        with pytest.raises(ValueError, match="Constants element.*missing 'pattern' attribute"):
-            parse_config_file(str(config_file))
-
-    def test_parse_config_constants_default_type(self, temp_dir):
+    def test_parse_config_constants_default_type(self):
         """Test that constants default to uint type"""
         config_content = """
         <bindings>
@@ -484,15 +410,12 @@ class TestXMLConfigParsing:
         </bindings>
         """
 
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
 
         assert len(config.global_constants) == 1
         assert config.global_constants[0] == ("TestFlags", "TEST_.*", "uint", False)
 
-    def test_parse_config_constants_with_flags(self, temp_dir):
+    def test_parse_config_constants_with_flags(self):
         """Test parsing constants with flags attribute"""
         config_content = """
         <bindings>
@@ -504,10 +427,7 @@ class TestXMLConfigParsing:
         </bindings>
         """
 
-        config_file = temp_dir / "config.xml"
-        config_file.write_text(config_content)
-
-        config = parse_config_file(str(config_file))
+        config = parse_config_string(config_content)
 
         assert len(config.global_constants) == 2
         # First constant has flags=true
@@ -515,8 +435,37 @@ class TestXMLConfigParsing:
         # Second constant defaults to flags=false
         assert config.global_constants[1] == ("InitFlags", "INIT_.*", "uint", False)
 
-    @pytest.fixture
-    def temp_dir(self):
-        """Fixture for temporary directory"""
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            yield Path(tmp_dir)
\ No newline at end of file
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture(scope="module")
+def config_schema():
+    """The shipped config schema, compiled once for the module"""
+    etree = pytest.importorskip("lxml.etree")
+    return etree.XMLSchema(etree.parse(str(REPO_ROOT / "cs_binding_generator" / "config.xsd")))
+
+
+@pytest.mark.parametrize("config_path", sorted(
+    str(path.relative_to(REPO_ROOT))
+    for path in [*REPO_ROOT.glob("docs/*.xml"), *REPO_ROOT.glob("test_dotnet/*/cs-bindings.xml")]
+))
+def test_config_schema_accepts_example_configs(config_schema, config_path):
+    """Test that the shipped schema accepts the example configs that parse_config_file accepts"""
+    from lxml import etree
+
+    parse_config_file(str(REPO_ROOT / config_path))
+    config_schema.assertValid(etree.parse(str(REPO_ROOT / config_path)))
+
+
+@pytest.mark.parametrize("config_content", [
+    pytest.param('<bindings><define value="1"/></bindings>', id="define_missing_name"),
+    pytest.param('<bindings><flags regex="true"/></bindings>', id="flags_missing_pattern"),
+    pytest.param('<bindings><library><include file="a.h"/></library></bindings>', id="library_missing_name"),
+    pytest.param('<bindings visibility="protected"/>', id="invalid_visibility"),
+])
+def test_config_schema_rejects_invalid_configs(config_schema, config_content):
+    """Test that the shipped schema rejects configs that parse_config_file rejects"""
+    from lxml import etree
+
+    assert not config_schema.validate(etree.fromstring(config_content))